@@ -13,16 +13,46 @@ Configuration is read from ``.aether/config.json`` and looks like::
 ``llm_backend`` is formatted as ``"<provider>:<model>"``.  Supported
 providers are ``openai`` and ``ollama``.  All dependencies are optional;
 :class:`LLMError` is raised when the backend cannot be used.
+
+Suggestions are cached on disk in ``.aether/llm_cache.sqlite`` keyed by the
+model and the function's source, docstring and calls, so repeated runs over
+unchanged functions do not hit the network.  An optional ``cache_ttl`` entry
+in the configuration limits the age (in seconds) of reused suggestions.
+
+Near-duplicate functions can share suggestions as well when an
+``embedding_backend`` (``"sentence-transformers:<model>"``,
+``"openai:<model>"`` or ``"ollama:<model>"``) is configured.  Function
+sources are embedded and a cached suggestion is reused when the cosine
+similarity exceeds ``semantic_threshold`` (default ``0.92``).  Only
+suggestions made by the same ``llm_backend`` model are reused.  The
+embeddings are appended to ``.aether/llm_embeddings.f32`` (keys in
+``llm_embeddings.jsonl``), are rebuilt when the embedding backend or its
+dimension changes and require ``numpy``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
-import urllib.request
-from dataclasses import dataclass
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Static instructions come first so providers with prompt caching can reuse
+# the shared prefix across requests; only the trailing function block varies.
+_PROMPT = (
+    "This function has high churn and poor documentation.\n\n"
+    "Suggest how this function could be refactored or renamed. "
+    "Respond in JSON with keys 'outline', 'name', and 'docstring'.\n\n"
+    "Function:\n{source}\n\n"
+    "Docstring:\n{docstring}\n\n"
+    "Call graph: {calls}"
+)
 
 
 class LLMError(RuntimeError):
@@ -63,10 +93,191 @@ class RefactorSuggestion:
     docstring: Optional[str] = None
 
 
+def _ollama_response(payload: Any, field: str = "response") -> Any:
+    """Return ``field`` of an Ollama reply, raising on error replies."""
+    if not isinstance(payload, dict) or "error" in payload or field not in payload:
+        error = payload.get("error") if isinstance(payload, dict) else payload
+        raise LLMError(f"Ollama request failed: {error}")
+    return payload[field]
+
+
+class _SuggestionCache:
+    """SQLite-backed store of suggestions keyed by content hash."""
+
+    def __init__(self, path: Path, *, ttl: Optional[float] = None) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestion_cache "
+                "(key TEXT PRIMARY KEY, json TEXT, ts REAL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[RefactorSuggestion]:
+        """Return the suggestion stored under ``key`` unless missing or stale."""
+        row = self._connect().execute(
+            "SELECT json, ts FROM suggestion_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, ts = row
+        if self.ttl is not None and time.time() - ts > self.ttl:
+            return None
+        return RefactorSuggestion(**json.loads(payload))
+
+    def put(self, key: str, suggestion: RefactorSuggestion) -> None:
+        """Store ``suggestion`` under ``key``."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestion_cache (key, json, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(asdict(suggestion)), time.time()),
+            )
+
+
+def _numpy() -> Any:
+    try:
+        import numpy  # type: ignore
+    except ImportError as exc:
+        raise LLMError("numpy package is not installed") from exc
+    return numpy
+
+
+class _SemanticIndex:
+    """Embedding rows mapping function sources to suggestion cache keys.
+
+    Rows are stored L2-normalised and grouped by LLM model, so cosine
+    similarity against every function cached for that model is a single
+    matrix-vector product and other models' suggestions are never reused.
+
+    Vectors are appended as raw ``float32`` to ``path`` and their keys and
+    models as JSON lines to a sidecar whose first line records the embedding
+    backend and dimension.  An index written by another backend or with a
+    different dimension is discarded and rebuilt.
+    """
+
+    def __init__(self, path: Path, *, threshold: float, embedding: str) -> None:
+        self.path = path
+        self.meta_path = path.with_suffix(".jsonl")
+        self.threshold = threshold
+        self.embedding = embedding
+        self._loaded = False
+        self._rewrite = False
+        self._dim: Optional[int] = None
+        # model -> [row buffer, used rows, keys]; buffers grow by doubling
+        self._groups: Dict[Optional[str], List[Any]] = {}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        np = _numpy()
+        try:
+            with self.meta_path.open(encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+                entries = [json.loads(line) for line in fh if line.strip()]
+            raw = self.path.read_bytes()
+        except (OSError, ValueError):
+            self._rewrite = True
+            return
+        dim = header.get("dim") if isinstance(header, dict) else None
+        if not dim or header.get("embedding") != self.embedding:
+            self._rewrite = True
+            return
+        row_bytes = dim * 4
+        rows = min(len(entries), len(raw) // row_bytes)
+        # A torn append leaves the two files out of step; rewrite them whole.
+        self._rewrite = rows != len(entries) or rows * row_bytes != len(raw)
+        self._dim = dim
+        matrix = np.frombuffer(raw, dtype=np.float32, count=rows * dim).reshape(rows, dim)
+        try:
+            for row, (key, model) in zip(matrix, entries):
+                self._append(model, row, key)
+        except (TypeError, ValueError):
+            self._reset()
+
+    def _reset(self) -> None:
+        self._dim = None
+        self._groups = {}
+        self._rewrite = True
+
+    def _normalise(self, vector: Any) -> Any:
+        np = _numpy()
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        vec = vec / norm if norm else vec
+        if self._dim is not None and vec.shape[0] != self._dim:
+            self._reset()
+        return vec
+
+    def _append(self, model: Optional[str], row: Any, key: str) -> None:
+        np = _numpy()
+        group = self._groups.setdefault(model, [None, 0, []])
+        buffer, size, keys = group
+        if buffer is None or size == len(buffer):
+            grown = np.empty((max(16, 2 * size), row.shape[0]), dtype=np.float32)
+            if size:
+                grown[:size] = buffer[:size]
+            group[0] = buffer = grown
+        buffer[size] = row
+        group[1] = size + 1
+        keys.append(key)
+
+    def lookup(self, vector: Any, model: Optional[str]) -> Optional[str]:
+        """Return the key of the most similar entry for ``model`` above the threshold."""
+        self._load()
+        vec = self._normalise(vector)
+        group = self._groups.get(model)
+        if group is None:
+            return None
+        buffer, size, keys = group
+        sims = buffer[:size] @ vec
+        best = int(sims.argmax())
+        if sims[best] > self.threshold:
+            return keys[best]
+        return None
+
+    def add(self, vector: Any, key: str, model: Optional[str]) -> None:
+        """Record ``vector`` for ``key`` under ``model`` and append it to disk."""
+        self._load()
+        vec = self._normalise(vector)
+        if self._dim is None:
+            self._dim = vec.shape[0]
+        self._append(model, vec, key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._rewrite:
+            self._write_all()
+            self._rewrite = False
+            return
+        with self.path.open("ab") as fh:
+            fh.write(vec.tobytes())
+        with self.meta_path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps([key, model]) + "\n")
+
+    def _write_all(self) -> None:
+        header = json.dumps({"embedding": self.embedding, "dim": self._dim})
+        with self.path.open("wb") as vf, self.meta_path.open("w", encoding="utf-8") as mf:
+            mf.write(header + "\n")
+            for model, (buffer, size, keys) in self._groups.items():
+                vf.write(buffer[:size].tobytes())
+                mf.writelines(json.dumps([key, model]) + "\n" for key in keys)
+
+
 class AIRefactorer:
     """Thin LLM client used to fetch refactor suggestions."""
 
-    def __init__(self, config_path: Path | str = Path(".aether/config.json")) -> None:
+    def __init__(
+        self,
+        config_path: Path | str = Path(".aether/config.json"),
+        *,
+        cache_path: Optional[Path | str] = None,
+    ) -> None:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         backend = self.config.get("llm_backend")
@@ -74,6 +285,22 @@ class AIRefactorer:
         self.model: Optional[str] = None
         if backend:
             self.backend_type, self.model = backend.split(":", 1)
+        cache_file = Path(cache_path) if cache_path else self.config_path.parent / "llm_cache.sqlite"
+        self._cache = _SuggestionCache(cache_file, ttl=self.config.get("cache_ttl"))
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._session: Any = None
+        self._embedder: Any = None
+        self.embedding_type: Optional[str] = None
+        self.embedding_model: Optional[str] = None
+        self._semantic: Optional[_SemanticIndex] = None
+        embedding = self.config.get("embedding_backend")
+        if embedding:
+            self.embedding_type, self.embedding_model = embedding.split(":", 1)
+            self._semantic = _SemanticIndex(
+                cache_file.with_name("llm_embeddings.f32"),
+                threshold=float(self.config.get("semantic_threshold", 0.92)),
+                embedding=embedding,
+            )
 
     def _load_config(self) -> Dict[str, Any]:
         if not self.config_path.exists():
@@ -97,16 +324,32 @@ class AIRefactorer:
         )
         return response["choices"][0]["message"]["content"].strip()
 
+    def _http_session(self) -> Any:
+        """Return a pooled ``requests`` session reused across calls."""
+        if self._session is None:
+            try:
+                import requests  # type: ignore
+            except ImportError as exc:
+                raise LLMError("requests package is not installed") from exc
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=8, max_retries=0
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
     def _call_ollama(self, prompt: str) -> str:
-        data = json.dumps({"model": self.model, "prompt": prompt}).encode("utf-8")
-        req = urllib.request.Request(
+        resp = self._http_session().post(  # pragma: no cover - network
             "http://localhost:11434/api/generate",
-            data=data,
-            headers={"Content-Type": "application/json"},
+            json={"model": self.model, "prompt": prompt, "stream": False},
+            headers={"Connection": "keep-alive", "Accept-Encoding": "gzip"},
+            timeout=120,
         )
-        with urllib.request.urlopen(req) as resp:  # pragma: no cover - network
-            payload = json.loads(resp.read().decode("utf-8"))
-        return payload.get("response", "")
+        if resp.status_code >= 400:
+            raise LLMError(f"Ollama request failed with HTTP {resp.status_code}: {resp.text[:200]}")
+        return _ollama_response(resp.json())
 
     def _request(self, prompt: str) -> str:
         if self.backend_type == "openai":
@@ -115,23 +358,92 @@ class AIRefactorer:
             return self._call_ollama(prompt)
         raise LLMError("No llm_backend configured")
 
-    def suggest_refactor(self, ctx: FunctionContext) -> RefactorSuggestion:
-        """Return a refactor suggestion for ``ctx``.
+    def _embed(self, texts: List[str]) -> List[Any]:
+        """Return one embedding per text, batching where the backend allows."""
+        if self.embedding_type == "sentence-transformers":
+            if self._embedder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer  # type: ignore
+                except ImportError as exc:
+                    raise LLMError("sentence-transformers package is not installed") from exc
+                self._embedder = SentenceTransformer(self.embedding_model)
+            return list(self._embedder.encode(texts))
+        if self.embedding_type == "openai":
+            try:
+                import openai  # type: ignore
+            except ImportError as exc:
+                raise LLMError("openai package is not installed") from exc
+            api_key = os.environ.get("OPENAI_API_KEY")
+            if not api_key:
+                raise LLMError("OPENAI_API_KEY environment variable not set")
+            openai.api_key = api_key
+            response = openai.Embedding.create(  # type: ignore[attr-defined]
+                model=self.embedding_model, input=texts
+            )
+            data = sorted(response["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
+        if self.embedding_type == "ollama":
+            # /api/embeddings takes a single prompt per request
+            vectors = []
+            for text in texts:
+                resp = self._http_session().post(  # pragma: no cover - network
+                    "http://localhost:11434/api/embeddings",
+                    json={"model": self.embedding_model, "prompt": text},
+                    timeout=120,
+                )
+                if resp.status_code >= 400:
+                    raise LLMError(f"Ollama request failed with HTTP {resp.status_code}: {resp.text[:200]}")
+                vectors.append(_ollama_response(resp.json(), "embedding"))
+            return vectors
+        raise LLMError(f"Unsupported embedding_backend: {self.embedding_type}")
 
-        The LLM is prompted to produce JSON containing optional ``outline``,
-        ``name`` and ``docstring`` fields.  If the response cannot be parsed,
-        the raw text is returned as the ``outline``.
+    def _lookup(self, ctx: FunctionContext, calls: List[str]) -> Tuple[str, Optional[RefactorSuggestion], Any]:
+        """Return the cache key, a cached suggestion if any and the embedding.
+
+        Hits are counted here; callers count a miss once they actually send
+        a request for it.
+
+        The exact-hash cache is consulted first so that hits skip embedding
+        entirely.  The embedding is only computed when semantic caching is
+        enabled and is returned so it can be indexed after a miss.
         """
+        key = self._cache_key(ctx, calls)
+        cached = self._cache.get(key)
+        vector = None
+        if cached is None and self._semantic is not None:
+            vector = self._embed([ctx.source])[0]
+            cached = self._lookup_similar(key, vector)
+        if cached is not None:
+            self.stats["hits"] += 1
+        return key, cached, vector
+
+    def _lookup_similar(self, key: str, vector: Any) -> Optional[RefactorSuggestion]:
+        """Return the suggestion of a similar cached function, storing it under ``key``."""
+        similar = self._semantic.lookup(vector, self.model)
+        if similar is None:
+            return None
+        cached = self._cache.get(similar)
+        if cached is not None:
+            self._cache.put(key, cached)
+        return cached
 
-        prompt = (
-            "This function has high churn and poor documentation.\n\n"
-            f"Function:\n{ctx.source}\n\n"
-            f"Docstring:\n{ctx.docstring or 'None'}\n\n"
-            f"Call graph: {list(ctx.calls)}\n\n"
-            "Suggest how this function could be refactored or renamed. "
-            "Respond in JSON with keys 'outline', 'name', and 'docstring'."
+    def _store(self, key: str, suggestion: RefactorSuggestion, vector: Any) -> None:
+        self._cache.put(key, suggestion)
+        if vector is not None and self._semantic is not None:
+            self._semantic.add(vector, key, self.model)
+
+    def _cache_key(self, ctx: FunctionContext, calls: List[str]) -> str:
+        payload = json.dumps(
+            {"model": self.model, "src": ctx.source, "doc": ctx.docstring, "calls": sorted(calls)},
+            sort_keys=True,
         )
-        text = self._request(prompt)
+        return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+    def _build_prompt(self, ctx: FunctionContext, calls: List[str]) -> str:
+        return _PROMPT.format(source=ctx.source, docstring=ctx.docstring or "None", calls=calls)
+
+    @staticmethod
+    def _parse_suggestion(text: str) -> RefactorSuggestion:
         try:
             data = json.loads(text)
         except json.JSONDecodeError:
@@ -142,6 +454,125 @@ class AIRefactorer:
             docstring=data.get("docstring"),
         )
 
+    def suggest_refactor(self, ctx: FunctionContext) -> RefactorSuggestion:
+        """Return a refactor suggestion for ``ctx``.
+
+        The LLM is prompted to produce JSON containing optional ``outline``,
+        ``name`` and ``docstring`` fields.  If the response cannot be parsed,
+        the raw text is returned as the ``outline``.  Previously cached
+        suggestions for identical functions are returned without a request.
+        """
+
+        calls = list(ctx.calls)
+        key, cached, vector = self._lookup(ctx, calls)
+        if cached is not None:
+            return cached
+
+        self.stats["misses"] += 1
+        suggestion = self._parse_suggestion(self._request(self._build_prompt(ctx, calls)))
+        self._store(key, suggestion, vector)
+        return suggestion
+
+    def _aiohttp_session(self, concurrency: int) -> Any:
+        try:
+            import aiohttp  # type: ignore
+        except ImportError as exc:
+            raise LLMError("aiohttp package is not installed") from exc
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+        return aiohttp.ClientSession(connector=connector)
+
+    async def _request_async(self, session: Any, prompt: str) -> str:
+        if self.backend_type == "ollama":
+            async with session.post(  # pragma: no cover - network
+                "http://localhost:11434/api/generate",
+                json={"model": self.model, "prompt": prompt, "stream": False},
+            ) as resp:
+                if resp.status >= 400:
+                    body = await resp.text()
+                    raise LLMError(f"Ollama request failed with HTTP {resp.status}: {body[:200]}")
+                payload = await resp.json(content_type=None)
+            return _ollama_response(payload)
+        return await asyncio.to_thread(self._request, prompt)
+
+    async def suggest_refactor_many(
+        self, ctxs: List[FunctionContext], *, concurrency: int = 8
+    ) -> List[Optional[RefactorSuggestion]]:
+        """Return suggestions for ``ctxs`` with concurrent backend requests.
+
+        Cached suggestions are returned directly, contexts sharing a cache
+        key share one request, and at most ``concurrency`` requests are in
+        flight at once.  When ``max_calls_per_run`` is configured only that
+        many requests are sent; the remaining contexts get ``None``.  If a
+        request fails the others still complete and are cached before the
+        first error is raised.  The result is aligned with ``ctxs``.
+        """
+
+        results: List[Optional[RefactorSuggestion]] = [None] * len(ctxs)
+        # key -> (indices sharing it, context, calls) for exact-cache misses
+        misses: Dict[str, Tuple[List[int], FunctionContext, List[str]]] = {}
+        for i, ctx in enumerate(ctxs):
+            calls = list(ctx.calls)
+            key = self._cache_key(ctx, calls)
+            if key in misses:
+                misses[key][0].append(i)
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                results[i] = cached
+            else:
+                misses[key] = ([i], ctx, calls)
+
+        # Embed every miss in one backend call, off the event loop
+        vectors: List[Any] = [None] * len(misses)
+        if misses and self._semantic is not None:
+            sources = [ctx.source for _, ctx, _ in misses.values()]
+            vectors = await asyncio.to_thread(self._embed, sources)
+
+        # key -> (indices sharing it, embedding, prompt); one request per key
+        pending: Dict[str, Tuple[List[int], Any, str]] = {}
+        for (key, (indices, ctx, calls)), vector in zip(misses.items(), vectors):
+            cached = self._lookup_similar(key, vector) if vector is not None else None
+            if cached is not None:
+                self.stats["hits"] += len(indices)
+                for index in indices:
+                    results[index] = cached
+            else:
+                pending[key] = (indices, vector, self._build_prompt(ctx, calls))
+
+        requests = list(pending.items())
+        max_calls = self.config.get("max_calls_per_run")
+        if max_calls is not None:
+            requests = requests[: int(max_calls)]
+        self.stats["misses"] += len(requests)
+
+        if requests:
+            semaphore = asyncio.Semaphore(concurrency)
+            session = self._aiohttp_session(concurrency) if self.backend_type == "ollama" else None
+
+            async def run(key: str, indices: List[int], vector: Any, prompt: str) -> None:
+                async with semaphore:
+                    text = await self._request_async(session, prompt)
+                suggestion = self._parse_suggestion(text)
+                self._store(key, suggestion, vector)
+                for index in indices:
+                    results[index] = suggestion
+
+            # Every request is allowed to finish (and be cached) before the
+            # session closes; the first failure is raised afterwards.
+            try:
+                outcomes = await asyncio.gather(
+                    *(run(key, *item) for key, item in requests), return_exceptions=True
+                )
+            finally:
+                if session is not None:
+                    await session.close()
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+
+        return results
+
 
 __all__ = [
     "AIRefactorer",
@@ -13,22 +13,104 @@ where it can be consumed by other AETHER components.
 from __future__ import annotations
 
 import ast
-import json
+import inspect
+import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
-
-
-def _called_functions(node: ast.AST) -> List[str]:
-    """Return sorted unique names of functions called within ``node``."""
-    calls = set()
-    for n in ast.walk(node):
-        if isinstance(n, ast.Call):
-            func = n.func
-            if isinstance(func, ast.Name):
-                calls.add(func.id)
-            elif isinstance(func, ast.Attribute):
-                calls.add(func.attr)
-    return sorted(calls)
+from typing import AbstractSet, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .jsonio import dumpb, loads
+from .parallel import map_in_processes
+
+# Parsing a typical module takes about 5 ms, so a spawned pool (~150 ms to
+# start) is only worth it from a few dozen changed files.
+_PARALLEL_MIN_FILES = 32
+
+_PRUNED_DIRS = frozenset({"__pycache__", "node_modules"})
+
+
+def _visit_call(node: ast.Call, owner: Optional[Set[str]], found: list) -> Optional[Set[str]]:
+    if owner is not None:
+        func = node.func
+        if isinstance(func, ast.Name):
+            owner.add(func.id)
+        elif isinstance(func, ast.Attribute):
+            owner.add(func.attr)
+    return owner
+
+
+def _visit_function(node: ast.AST, owner: Optional[Set[str]], found: list) -> Optional[Set[str]]:
+    # Only top-level functions are recorded; nested ones add to their parent.
+    if owner is None:
+        owner = set()
+        found.append((node, owner))
+    return owner
+
+
+# Node types that cannot contain a call; they are never pushed on the stack.
+_LEAF_TYPES = frozenset(
+    [
+        cls
+        for base in (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop)
+        for cls in base.__subclasses__()
+    ]
+    + [
+        ast.Name,
+        ast.Constant,
+        ast.alias,
+        ast.Pass,
+        ast.Break,
+        ast.Continue,
+        ast.Global,
+        ast.Nonlocal,
+        ast.Import,
+        ast.ImportFrom,
+    ]
+)
+
+_VISITORS = {
+    "Call": _visit_call,
+    "FunctionDef": _visit_function,
+    "AsyncFunctionDef": _visit_function,
+}
+
+
+def _docstring(node: ast.AST) -> str:
+    """Return the cleaned docstring of ``node`` or an empty string."""
+    body = node.body  # type: ignore[attr-defined]
+    if body and isinstance(body[0], ast.Expr):
+        value = body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return inspect.cleandoc(value.value)
+    return ""
+
+
+def _top_level_functions(tree: ast.Module) -> List[Tuple[ast.AST, Set[str]]]:
+    """Return top-level functions of ``tree`` with the names they call.
+
+    The tree is traversed once with an explicit stack of ``(node, calls)``
+    pairs; statements outside functions and nodes in ``_LEAF_TYPES`` are
+    never pushed.
+    """
+    found: List[Tuple[ast.AST, Set[str]]] = []
+    stack: List[Tuple[ast.AST, Optional[Set[str]]]] = [(node, None) for node in reversed(tree.body)]
+    while stack:
+        node, owner = stack.pop()
+        visit = _VISITORS.get(type(node).__name__)
+        if visit is not None:
+            owner = visit(node, owner, found)
+        if owner is None:
+            continue
+        for field in node._fields:
+            child = getattr(node, field, None)
+            if isinstance(child, list):
+                stack.extend(
+                    (item, owner)
+                    for item in child
+                    if type(item) not in _LEAF_TYPES and isinstance(item, ast.AST)
+                )
+            elif type(child) not in _LEAF_TYPES and isinstance(child, ast.AST):
+                stack.append((child, owner))
+    return found
 
 
 def extract_file_context(path: Path) -> Dict[str, object]:
@@ -49,43 +131,112 @@ def extract_file_context(path: Path) -> Dict[str, object]:
     source = path.read_text(encoding="utf-8")
     tree = ast.parse(source)
 
-    doc = ast.get_docstring(tree) or ""
+    doc = _docstring(tree)
     summary = doc.strip().splitlines()[0] if doc else ""
 
     functions: Dict[str, Dict[str, object]] = {}
-    for node in tree.body:
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            func_doc = ast.get_docstring(node) or ""
-            lines = getattr(node, "end_lineno", node.lineno) - node.lineno + 1
-            functions[node.name] = {
-                "docstring": func_doc.strip(),
-                "calls": _called_functions(node),
-                "lines": lines,
-            }
+    for node, calls in _top_level_functions(tree):
+        lines = getattr(node, "end_lineno", node.lineno) - node.lineno + 1
+        functions[node.name] = {
+            "docstring": _docstring(node).strip(),
+            "calls": sorted(calls),
+            "lines": lines,
+        }
 
     return {"summary": summary, "functions": functions}
 
 
-def build_context_map(root: Path, *, output_path: Optional[Path] = None) -> Dict[str, object]:
+def iter_py_files(
+    root: Union[str, Path],
+    *,
+    prune: AbstractSet[str] = frozenset(),
+    keep_hidden: AbstractSet[str] = frozenset(),
+) -> Iterator[str]:
+    """Yield paths of ``*.py`` files under ``root``.
+
+    Directories named in ``prune`` and hidden directories not listed in
+    ``keep_hidden`` are skipped without being listed, as are unreadable
+    ones.  ``os.scandir`` entries carry their file type, so no extra
+    ``stat`` call is made per entry.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name in prune or (name.startswith(".") and name not in keep_hidden):
+                        continue
+                    stack.append(entry.path)
+                elif name.endswith(".py"):
+                    yield entry.path
+
+
+def _load_cache(path: Path) -> Dict[str, Dict[str, object]]:
+    """Return the parse cache stored at ``path`` or an empty mapping."""
+    if not path.exists():
+        return {}
+    try:
+        return loads(path.read_bytes())
+    except ValueError:
+        return {}
+
+
+def build_context_map(
+    root: Path,
+    *,
+    output_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, object]:
     """Build a context map for all ``*.py`` files under ``root``.
 
-    The map is also written to ``output_path`` which defaults to
+    Results are cached next to the map (``context_map.cache.json`` for
+    ``context_map.json``) keyed by file modification time and size, so only
+    changed files are parsed again, in up to ``max_workers`` processes when
+    there are many of them.  The map is also written to ``output_path`` which defaults to
     ``root/.aether/context_map.json``.
     """
 
-    context: Dict[str, Dict[str, object]] = {}
-    for file in sorted(root.rglob("*.py")):
-        # Skip hidden directories except ``.aether``
-        if any(part.startswith(".") and part != ".aether" for part in file.relative_to(root).parts[:-1]):
-            continue
-        context[str(file.relative_to(root))] = extract_file_context(file)
-
     out_dir = root / ".aether"
     out_dir.mkdir(exist_ok=True)
     out = output_path or (out_dir / "context_map.json")
-    with out.open("w", encoding="utf-8") as fh:
-        json.dump(context, fh, indent=2, sort_keys=True)
+    cache_path = out.with_suffix(".cache.json")
+    cache = _load_cache(cache_path)
+
+    context: Dict[str, Dict[str, object]] = {}
+    new_cache: Dict[str, Dict[str, object]] = {}
+    misses: List[Tuple[str, Path]] = []
+    files = iter_py_files(root, prune=_PRUNED_DIRS, keep_hidden={".aether"})
+    for file in sorted(map(Path, files)):
+        rel = str(file.relative_to(root))
+        st = file.stat()
+        entry = {"mtime": st.st_mtime_ns, "size": st.st_size}
+        prev = cache.get(rel)
+        if prev and prev.get("mtime") == entry["mtime"] and prev.get("size") == entry["size"]:
+            entry["ctx"] = prev["ctx"]
+        else:
+            misses.append((rel, file))
+        context[rel] = entry.get("ctx")  # type: ignore[assignment]
+        new_cache[rel] = entry
+
+    results = map_in_processes(
+        extract_file_context,
+        [file for _, file in misses],
+        min_items=_PARALLEL_MIN_FILES,
+        max_workers=max_workers,
+        chunksize=16,
+    )
+    for (rel, _), ctx in zip(misses, results):
+        context[rel] = ctx
+        new_cache[rel]["ctx"] = ctx
+
+    out.write_bytes(dumpb(context, indent=True, sort_keys=True))
+    cache_path.write_bytes(dumpb(new_cache))
     return context
 
 
-__all__ = ["extract_file_context", "build_context_map"]
+__all__ = ["extract_file_context", "iter_py_files", "build_context_map"]
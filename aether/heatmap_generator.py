@@ -7,9 +7,13 @@ simple bar charts so hotspots are easy to spot.
 
 from __future__ import annotations
 
-import json
+import bisect
+import functools
+import io
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Tuple
+
+from .jsonio import loads
 
 
 def load_risk_map(path: Path) -> Dict[str, Dict[str, float]]:
@@ -21,8 +25,7 @@ def load_risk_map(path: Path) -> Dict[str, Dict[str, float]]:
     """
     if not path.exists():
         return {}
-    with path.open("r", encoding="utf-8") as fh:
-        data = json.load(fh)
+    data = loads(path.read_bytes())
     if isinstance(data, list):
         result: Dict[str, Dict[str, float]] = {}
         for entry in data:
@@ -33,20 +36,25 @@ def load_risk_map(path: Path) -> Dict[str, Dict[str, float]]:
     return data
 
 
+@functools.lru_cache(maxsize=None)
+def _bar_table(width: int) -> Tuple[str, ...]:
+    """Return every possible bar of ``width`` characters indexed by fill."""
+    return tuple("█" * filled + " " * (width - filled) for filled in range(width + 1))
+
+
 def _bar(value: float, *, width: int = 10) -> str:
     """Return a bar of ``width`` characters representing ``value``."""
     value = max(0.0, min(1.0, value))
-    filled = int(round(value * width))
-    return "█" * filled + " " * (width - filled)
+    return _bar_table(width)[int(round(value * width))]
+
+
+_PRIORITY_THRESHOLDS = (0.4, 0.7)
+_PRIORITY_LABELS = ("LOW", "MED", "HIGH")
 
 
 def _priority(risk: float) -> str:
     """Map numeric risk to a textual priority level."""
-    if risk >= 0.7:
-        return "HIGH"
-    if risk >= 0.4:
-        return "MED"
-    return "LOW"
+    return _PRIORITY_LABELS[bisect.bisect_right(_PRIORITY_THRESHOLDS, risk)]
 
 
 def ascii_heatmap(risk_map_path: Path, *, width: int = 10) -> str:
@@ -66,20 +74,26 @@ def ascii_heatmap(risk_map_path: Path, *, width: int = 10) -> str:
     """
     risk_map = load_risk_map(risk_map_path)
     header = f"{'File':<40} {'Risk':<{width + 6}} {'Churn':<{width + 6}} Priority"
-    lines = [header, "-" * len(header)]
+    row = "{file:<40} {risk_bar} {risk:>5.2f} {churn_bar} {churn:>5.2f} {priority}\n".format
+    buf = io.StringIO()
+    buf.write(header + "\n")
+    buf.write("-" * len(header) + "\n")
 
     for file, metrics in sorted(risk_map.items(), key=lambda x: x[1].get('risk', 0), reverse=True):
         risk = float(metrics.get('risk', 0.0))
         churn = float(metrics.get('commit_factor', 0.0))
-        line = (
-            f"{file:<40} "
-            f"{_bar(risk, width=width)} {risk:>5.2f} "
-            f"{_bar(churn, width=width)} {churn:>5.2f} "
-            f"{_priority(risk)}"
+        buf.write(
+            row(
+                file=file,
+                risk_bar=_bar(risk, width=width),
+                risk=risk,
+                churn_bar=_bar(churn, width=width),
+                churn=churn,
+                priority=_priority(risk),
+            )
         )
-        lines.append(line)
 
-    return "\n".join(lines)
+    return buf.getvalue()[:-1]
 
 
 __all__ = ["ascii_heatmap", "load_risk_map"]
@@ -0,0 +1,43 @@
+"""JSON helpers preferring :mod:`orjson` when it is installed.
+
+``orjson`` decodes and encodes considerably faster than the standard library
+which matters for large risk and context maps.  The fallback keeps the
+package free of hard dependencies.  ``dumps`` mirrors the ``indent=2`` and
+``sort_keys`` options used across AETHER.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson
+    orjson = None  # type: ignore[assignment]
+    import json
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Return the object decoded from ``data``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+    """Return ``obj`` encoded as JSON, indented by two spaces if ``indent``."""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys)
+
+
+def dumpb(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Return ``obj`` encoded as UTF-8 JSON bytes; see :func:`dumps`."""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    return dumps(obj, indent=indent, sort_keys=sort_keys).encode("utf-8")
+
+
+__all__ = ["loads", "dumps", "dumpb"]
@@ -0,0 +1,62 @@
+"""Map CPU-bound work over a process pool once the batch is large enough.
+
+Starting a pool has a fixed cost: a few milliseconds per worker where
+processes are forked, but roughly 150 ms where they are spawned (macOS,
+Windows) because every worker imports the package again.  Callers therefore
+pass the batch size from which a pool pays off for their own per-item cost.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_in_processes(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    min_items: int,
+    max_workers: Optional[int] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Sequence[Any] = (),
+    chunksize: int = 1,
+) -> List[R]:
+    """Return ``[fn(item) for item in items]``, in a process pool if worthwhile.
+
+    Parameters
+    ----------
+    fn:
+        Picklable function applied to every item.
+    items:
+        Inputs; results keep their order.
+    min_items:
+        Smallest batch that is handed to a pool.  Smaller batches, or runs
+        limited to a single worker, are mapped in this process.
+    max_workers:
+        Worker count, defaulting to the CPU count and capped at the number
+        of items.
+    initializer, initargs:
+        Called once per worker, or once in this process when mapping
+        serially, so that ``fn`` sees the same state either way.
+    chunksize:
+        Items sent to a worker at a time.
+    """
+
+    items = list(items)
+    workers = min(max_workers or os.cpu_count() or 1, len(items))
+    if len(items) < min_items or workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=tuple(initargs)
+    ) as ex:
+        return list(ex.map(fn, items, chunksize=chunksize))
+
+
+__all__ = ["map_in_processes"]
@@ -8,10 +8,14 @@ is left untouched.
 
 from __future__ import annotations
 
-import json
+import shutil
 from pathlib import Path
 from typing import Iterable, Dict, Any
 
+from .jsonio import loads
+
+_COPY_CHUNK = 64 * 1024
+
 
 def load_risk_map(path: Path) -> Iterable[Dict[str, Any]]:
     """Load risk map entries from ``path``.
@@ -22,13 +26,36 @@ def load_risk_map(path: Path) -> Iterable[Dict[str, Any]]:
     """
     if not path.exists():
         return []
-    with path.open("r", encoding="utf-8") as fh:
-        data = json.load(fh)
+    data = loads(path.read_bytes())
     if isinstance(data, dict):
         return data.values()
     return data
 
 
+def _patch_is_current(source_path: Path, patch_path: Path, header: bytes) -> bool:
+    """Return ``True`` if ``patch_path`` already holds ``header`` plus the source.
+
+    Sizes are compared first; otherwise the patch is compared with the header
+    and the source chunk by chunk, so stale patches are caught even when the
+    source keeps its size and an older modification time.
+    """
+    try:
+        patch_stat = patch_path.stat()
+    except FileNotFoundError:
+        return False
+    if patch_stat.st_size != len(header) + source_path.stat().st_size:
+        return False
+    with patch_path.open("rb") as patch, source_path.open("rb") as src:
+        if patch.read(len(header)) != header:
+            return False
+        while True:
+            chunk = src.read(_COPY_CHUNK)
+            if chunk != patch.read(len(chunk)):
+                return False
+            if not chunk:
+                return True
+
+
 def write_patches(risk_map_path: Path, project_root: Path, *, threshold: float = 0.7) -> list[Path]:
     """Generate patch files for high-risk entries.
 
@@ -65,16 +92,14 @@ def write_patches(risk_map_path: Path, project_root: Path, *, threshold: float =
         patch_path = patch_root / filename
         patch_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with source_path.open("r", encoding="utf-8") as fh:
-            original = fh.read()
-
         suggestion_lines = [f"# [AETHER SUGGESTION]: {s}" for s in suggestions]
         suggestion_block = "\n".join(suggestion_lines)
+        header = (suggestion_block + "\n\n").encode("utf-8") if suggestion_block else b""
 
-        with patch_path.open("w", encoding="utf-8") as fh:
-            if suggestion_block:
-                fh.write(suggestion_block + "\n\n")
-            fh.write(original)
+        if not _patch_is_current(source_path, patch_path, header):
+            with source_path.open("rb") as src, patch_path.open("wb") as dst:
+                dst.write(header)
+                shutil.copyfileobj(src, dst, _COPY_CHUNK)
 
         patched_files.append(patch_path)
 
@@ -15,6 +15,7 @@ more complex or under‑documented code for mutation.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any, Dict, Iterable, List, Optional
 
 
@@ -81,40 +82,33 @@ def gather_rewrite_hints(context_map: Dict[str, Any]) -> List[RewriteHint]:
     """
 
     hints: List[RewriteHint] = []
+    append = hints.append
     for file, info in context_map.items():
-        functions = info.get("functions", {})
-        for fname, meta in functions.items():
+        for fname, meta in info.get("functions", {}).items():
             doc = meta.get("docstring", "").strip()
             calls = meta.get("calls", [])
-            lines = int(meta.get("lines", 0))
-
-            score = 0
-            generated_doc: Optional[str] = None
-
-            if not doc:
-                score += 1
-                generated_doc = _auto_docstring(fname, calls)
-            if len(calls) >= 5:
-                score += 1
-            if lines > 40:
-                score += 1
-            if not doc and not calls:
-                score += 1
-
-            rename = _rename_suggestion(fname, doc)
+            undocumented = not doc
+            # Booleans sum as integers, one per heuristic.
+            score = (
+                undocumented
+                + (len(calls) >= 5)
+                + (int(meta.get("lines", 0)) > 40)
+                + (undocumented and not calls)
+            )
+            rename = None if undocumented else _rename_suggestion(fname, doc)
 
             if score > 0 or rename:
-                hints.append(
+                append(
                     RewriteHint(
                         file=file,
                         function=fname,
                         score=score,
-                        docstring=generated_doc,
+                        docstring=_auto_docstring(fname, calls) if undocumented else None,
                         rename_to=rename,
                     )
                 )
 
-    hints.sort(key=lambda h: h.score, reverse=True)
+    hints.sort(key=attrgetter("score"), reverse=True)
     return hints
 
 
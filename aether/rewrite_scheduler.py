@@ -52,20 +52,17 @@ def schedule_rewrites(
         trajectory mapping including cadence information.
     """
 
-    updated = {k: v.copy() for k, v in trajectory.items()}
+    updated: Dict[str, Any] = {}
     to_rewrite: List[str] = []
 
-    for fname, info in updated.items():
-        history = info.get("history", [])
-        # Increment cadence; reset when scheduled for rewrite
-        cadence = int(info.get("cadence", 0)) + 1
-        info["cadence"] = cadence
-
-        recent = history[-stagnation_runs:]
-        if not any(h.get("reinforcement", 0) > 0 for h in recent):
+    for fname, info in trajectory.items():
+        recent = info.get("history", [])[-stagnation_runs:]
+        if any(h.get("reinforcement", 0) > 0 for h in recent):
+            # Increment cadence; reset when scheduled for rewrite
+            updated[fname] = {**info, "cadence": int(info.get("cadence", 0)) + 1}
+        else:
             to_rewrite.append(fname)
-            info["cadence"] = 0
-            info["last_scheduled_run"] = run_id
+            updated[fname] = {**info, "cadence": 0, "last_scheduled_run": run_id}
 
     return Schedule(to_rewrite, updated)
 
@@ -11,11 +11,26 @@ from dataclasses import dataclass
 from enum import Enum
 import ast
 import difflib
+import re
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .parallel import map_in_processes
 from .patch_writer import load_risk_map
 
+# ``(line index in original, removed lines, inserted lines)`` without newlines.
+Edit = Tuple[int, List[str], List[str]]
+
+_HANDLED_TODO = "TODO handled by AETHER"
+_UNHANDLED_TODO = re.compile(r"TODO(?! handled by AETHER)")
+
+_AST_STRATEGIES = frozenset({"insert_docstring", "split_function"})
+
+# Docstring and split rewrites take about 6 ms per entry (TODO marking far
+# less), which repays a spawned pool from roughly 32 entries.
+_PARALLEL_MIN_ENTRIES = 32
+
 
 class Confidence(str, Enum):
     """Confidence levels assigned to mutations."""
@@ -51,11 +66,13 @@ def select_strategy(entry: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _insert_docstring(source: str) -> str:
+def _insert_docstring(source: str, tree: Optional[ast.Module] = None) -> Tuple[str, List[Edit]]:
     """Insert placeholder docstrings into functions lacking them."""
 
-    tree = ast.parse(source)
+    if tree is None:
+        tree = ast.parse(source)
     lines = source.splitlines()
+    edits: List[Edit] = []
 
     for node in tree.body:
         if isinstance(node, ast.FunctionDef):
@@ -64,25 +81,42 @@ def _insert_docstring(source: str) -> str:
                 doc = f'{indent}"""TODO: documented by AETHER."""  # [AETHER_REWRITE]'
                 insert_line = node.body[0].lineno - 1
                 lines.insert(insert_line, doc)
+                edits.append((insert_line, [], [doc]))
                 break
-    return "\n".join(lines) + "\n"
+    return "\n".join(lines) + "\n", edits
+
 
+def _complete_todo(source: str) -> Tuple[str, List[Edit]]:
+    """Mark TODO comments as handled by AETHER.
 
-def _complete_todo(source: str) -> str:
-    """Mark TODO comments as handled by AETHER."""
+    TODOs already marked by an earlier run are left untouched.
+    """
 
-    replaced: List[str] = []
-    for line in source.splitlines():
-        if "TODO" in line:
-            line = line.replace("TODO", "TODO handled by AETHER")
-        replaced.append(line)
-    return "\n".join(replaced) + "\n"
+    if "TODO" not in source:
+        return (source if source.endswith("\n") else source + "\n"), []
 
+    edits: List[Edit] = []
+    line_no = 0
+    line_start = 0
+    for match in _UNHANDLED_TODO.finditer(source):
+        start = source.rfind("\n", 0, match.start()) + 1
+        if edits and start == line_start:
+            continue  # line already recorded
+        line_no += source.count("\n", line_start, start)
+        line_start = start
+        end = source.find("\n", start)
+        line = source[start:] if end == -1 else source[start:end]
+        edits.append((line_no, [line], [_UNHANDLED_TODO.sub(_HANDLED_TODO, line)]))
 
-def _split_function(source: str) -> str:
+    mutated = _UNHANDLED_TODO.sub(_HANDLED_TODO, source)
+    return (mutated if mutated.endswith("\n") else mutated + "\n"), edits
+
+
+def _split_function(source: str, tree: Optional[ast.Module] = None) -> Tuple[str, List[Edit]]:
     """Move the body of the first function into a helper."""
 
-    tree = ast.parse(source)
+    if tree is None:
+        tree = ast.parse(source)
     lines = source.splitlines()
 
     target: Optional[ast.FunctionDef] = None
@@ -91,7 +125,7 @@ def _split_function(source: str) -> str:
             target = node
             break
     if not target or target.end_lineno is None:
-        return source
+        return source, []
 
     indent = " " * target.col_offset
     helper_name = f"_{target.name}_impl"
@@ -113,19 +147,102 @@ def _split_function(source: str) -> str:
     helper_def.extend(body_lines)
 
     mutated_lines = lines[:start] + wrapper + lines[end:] + ["", *helper_def]
-    return "\n".join(mutated_lines) + "\n"
+    edits: List[Edit] = [
+        (start, lines[start:end], wrapper),
+        (len(lines), [], ["", *helper_def]),
+    ]
+    return "\n".join(mutated_lines) + "\n", edits
 
 
-def _write_diff(original: str, mutated: str, path: Path) -> None:
-    """Write a unified diff between ``original`` and ``mutated`` to ``path``."""
+class _KnownOpcodes(difflib.SequenceMatcher):
+    """Sequence matcher that reports precomputed opcodes instead of matching."""
+
+    def __init__(self, opcodes: List[Tuple[str, int, int, int, int]]) -> None:
+        super().__init__(None, "", "")
+        self.opcodes = opcodes
+
+    def get_opcodes(self) -> List[Tuple[str, int, int, int, int]]:
+        return self.opcodes
 
-    diff = difflib.unified_diff(
-        original.splitlines(keepends=True),
-        mutated.splitlines(keepends=True),
-        fromfile="original",
-        tofile="mutated",
-    )
-    path.write_text("".join(diff), encoding="utf-8")
+
+def _edit_opcodes(
+    a: List[str], edits: List[Edit]
+) -> Optional[Tuple[List[str], List[Tuple[str, int, int, int, int]]]]:
+    """Return mutated lines and ``difflib`` opcodes for ``edits`` applied to ``a``.
+
+    ``None`` is returned when the edits overlap or fall outside ``a``.
+    """
+
+    b: List[str] = []
+    opcodes: List[Tuple[str, int, int, int, int]] = []
+    i = 0
+    for start, removed, inserted in sorted(edits, key=lambda e: e[0]):
+        if start < i or start + len(removed) > len(a):
+            return None
+        if start > i:
+            opcodes.append(("equal", i, start, len(b), len(b) + start - i))
+            b.extend(a[i:start])
+        if removed and inserted:
+            tag = "replace"
+        elif removed:
+            tag = "delete"
+        elif inserted:
+            tag = "insert"
+        else:
+            continue
+        j = len(b)
+        b.extend(line + "\n" for line in inserted)
+        opcodes.append((tag, start, start + len(removed), j, len(b)))
+        i = start + len(removed)
+    if i < len(a):
+        opcodes.append(("equal", i, len(a), len(b), len(b) + len(a) - i))
+        b.extend(a[i:])
+    return b, opcodes
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a unified diff line range like :mod:`difflib` does."""
+
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def _write_diff(
+    original: str, mutated: str, path: Path, edits: Optional[List[Edit]] = None
+) -> None:
+    """Write a unified diff between ``original`` and ``mutated`` to ``path``.
+
+    When the mutator reports its ``edits`` and they reproduce ``mutated``
+    exactly, hunks are built from them directly instead of running
+    :class:`difflib.SequenceMatcher` over both sources.
+    """
+
+    a = original.splitlines(keepends=True)
+    known = _edit_opcodes(a, edits) if edits is not None else None
+    if known is None or "".join(known[0]) != mutated:
+        diff = difflib.unified_diff(a, mutated.splitlines(keepends=True), fromfile="original", tofile="mutated")
+        path.write_text("".join(diff), encoding="utf-8")
+        return
+
+    b, opcodes = known
+    out: List[str] = []
+    for group in _KnownOpcodes(opcodes).get_grouped_opcodes(3):
+        if not out:
+            out.append("--- original\n")
+            out.append("+++ mutated\n")
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            out.extend("-" + line for line in a[i1:i2])
+            out.extend("+" + line for line in b[j1:j2])
+    path.write_text("".join(out), encoding="utf-8")
 
 
 def rewrite_file(entry: Dict[str, Any], project_root: Path) -> Optional[RewriteResult]:
@@ -142,14 +259,17 @@ def rewrite_file(entry: Dict[str, Any], project_root: Path) -> Optional[RewriteR
     with src_path.open("r", encoding="utf-8") as fh:
         original = fh.read()
 
+    # Parse once and share the tree between AST based strategies
+    tree = ast.parse(original) if strategy in _AST_STRATEGIES else None
+    edits: Optional[List[Edit]]
     if strategy == "insert_docstring":
-        mutated_src = _insert_docstring(original)
+        mutated_src, edits = _insert_docstring(original, tree)
     elif strategy == "complete_todo":
-        mutated_src = _complete_todo(original)
+        mutated_src, edits = _complete_todo(original)
     elif strategy == "split_function":
-        mutated_src = _split_function(original)
+        mutated_src, edits = _split_function(original, tree)
     else:
-        mutated_src = original
+        mutated_src, edits = original, []
 
     mut_path = project_root / "__aether_mutation__" / entry.get("filename", "")
     mut_path.parent.mkdir(parents=True, exist_ok=True)
@@ -157,7 +277,7 @@ def rewrite_file(entry: Dict[str, Any], project_root: Path) -> Optional[RewriteR
         fh.write(mutated_src)
 
     diff_path = mut_path.with_suffix(mut_path.suffix + ".diff")
-    _write_diff(original, mutated_src, diff_path)
+    _write_diff(original, mutated_src, diff_path, edits)
 
     risk = float(entry.get("risk_score", 0))
     confidence = Confidence.HIGH if risk > 0.85 else Confidence.LOW
@@ -166,19 +286,29 @@ def rewrite_file(entry: Dict[str, Any], project_root: Path) -> Optional[RewriteR
 
 
 def rewrite_from_risk_map(
-    risk_map_path: Path, project_root: Path, *, threshold: float = 0.7
+    risk_map_path: Path,
+    project_root: Path,
+    *,
+    threshold: float = 0.7,
+    max_workers: Optional[int] = None,
 ) -> List[RewriteResult]:
-    """Run rewrites for all qualifying entries in ``risk_map_path``."""
+    """Run rewrites for all qualifying entries in ``risk_map_path``.
 
-    entries = load_risk_map(risk_map_path)
-    results: List[RewriteResult] = []
-    for entry in entries:
-        if float(entry.get("risk_score", 0)) < threshold:
-            continue
-        res = rewrite_file(entry, project_root)
-        if res:
-            results.append(res)
-    return results
+    Large risk maps are rewritten in up to ``max_workers`` processes.
+    """
+
+    entries = [
+        entry
+        for entry in load_risk_map(risk_map_path)
+        if float(entry.get("risk_score", 0)) >= threshold
+    ]
+    outcomes = map_in_processes(
+        partial(rewrite_file, project_root=project_root),
+        entries,
+        min_items=_PARALLEL_MIN_ENTRIES,
+        max_workers=max_workers,
+    )
+    return [res for res in outcomes if res]
 
 
 __all__ = [
@@ -8,57 +8,53 @@ human inspection of long‑term trends.
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Tuple
+
+from .jsonio import loads
 
 
 def _load(path: Path) -> Dict[str, Any]:
     """Return JSON content from ``path`` if it exists."""
     if not path.exists():
         return {}
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
-
-
-def _sparkline(history: List[Dict[str, Any]]) -> str:
-    """Return a simple sparkline for ``history`` entries."""
-    symbols = []
-    for entry in history:
-        if entry.get("change") == "resolved":
-            symbols.append("✓")
-            continue
-        delta = entry.get("reinforcement", 0)
-        if delta > 0:
-            symbols.append("↑")
-        elif delta < 0:
-            symbols.append("↓")
-        else:
-            symbols.append("-")
-    return "".join(symbols)
-
-
-def _status(entry: Dict[str, Any]) -> str:
-    """Determine long‑term status for a trajectory ``entry``."""
-    last_change = entry.get("last_change")
-    if last_change == "resolved":
-        return "Resolved"
+    return loads(path.read_bytes())
+
+
+_SYMBOLS = ("-", "↑", "↓", "✓")
+
 
+def _summarize(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Return long‑term status and history sparkline for a trajectory ``entry``.
+
+    Both are derived from a single pass over the entry's history.
+    """
     history = entry.get("history", [])
-    deltas = [h.get("reinforcement", 0) for h in history]
-    if deltas:
-        if all(d >= 0 for d in deltas):
-            return "Healing"
-        if all(d <= 0 for d in deltas):
-            return "Regressing"
+    symbols = [""] * len(history)
+    any_pos = any_neg = False
+    for i, h in enumerate(history):
+        delta = h.get("reinforcement", 0)
+        pos = delta > 0
+        neg = delta < 0
+        any_pos = any_pos or pos
+        any_neg = any_neg or neg
+        symbols[i] = _SYMBOLS[3 if h.get("change") == "resolved" else pos + 2 * neg]
+    sparkline = "".join(symbols)
+
+    last_change = entry.get("last_change")
+    if last_change == "resolved":
+        return "Resolved", sparkline
+    if history:
+        if not any_neg:
+            return "Healing", sparkline
+        if not any_pos:
+            return "Regressing", sparkline
     total = entry.get("total_reinforcement", 0)
     if total > 0 and last_change == "risk_down":
-        return "Healing"
+        return "Healing", sparkline
     if total < 0 and last_change == "risk_up":
-        return "Regressing"
-    if any(d > 0 for d in deltas) and any(d < 0 for d in deltas):
-        return "Oscillating"
-    return "Oscillating"
+        return "Regressing", sparkline
+    return "Oscillating", sparkline
 
 
 def render_trajectory_summary(trajectory_path: Path, output_path: Path) -> str:
@@ -86,14 +82,13 @@ def render_trajectory_summary(trajectory_path: Path, output_path: Path) -> str:
     for fname, info in sorted(data.items()):
         total = info.get("total_reinforcement", 0)
         last = info.get("last_change", "")
-        status = _status(info)
-        history = _sparkline(info.get("history", []))
+        status, history = _summarize(info)
         line = f"{fname:<17} {total:>6}   {last:<12} {status:<11} {history}"
         lines.append(line)
 
     output = "\n".join(lines)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output + "\n", encoding="utf-8")
+    output_path.write_bytes((output + "\n").encode("utf-8"))
     return output
 
 
@@ -1,13 +1,42 @@
 import ast
+import io
 import os
 import re
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+import shutil
+import subprocess
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from git import Repo
+from git.exc import GitCommandError
+
+from aether.code_context import iter_py_files
+from aether.jsonio import dumpb, loads
+from aether.parallel import map_in_processes
 
 TODO_PATTERN = re.compile(r"#.*\b(TODO|FIXME)\b", re.IGNORECASE)
+TODO_PATTERN_B = re.compile(TODO_PATTERN.pattern.encode(), re.IGNORECASE)
+SKIP_DIRS = {".git", "venv", "node_modules", ".venv", "__pycache__"}
+# Hunk headers (capturing the new-file start line), additions and deletions.
+_PATCH_LINE = re.compile(rb'^(?:@@(?:.*?\+(\d+))?|\+|-)', re.MULTILINE)
+# Plain substrings, so "prefix" still counts as a fix, without lower-casing
+# every commit message.
+_TEST_WORD = re.compile('test', re.IGNORECASE)
+_FAILURE_WORD = re.compile('fail|fix|broken', re.IGNORECASE)
 NULL_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+# LRU of function indexes keyed by blob sha; each worker process has its own.
+_RANGES_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_RANGES_CACHE_SIZE = 8192
+# A commit's diff and function index take about 3 ms, so a spawned pool
+# (~150 ms to start, plus a Repo per worker) needs ~48 of them to pay off.
+_PARALLEL_MIN_COMMITS = 48
+# Bump when the layout of the analyzer cache changes.
+_CACHE_VERSION = 1
 
 def get_function_ranges(source: str) -> List[Tuple[str, int, int]]:
     """Return list of (name, start, end) for functions in source."""
@@ -26,82 +55,346 @@ def get_function_ranges(source: str) -> List[Tuple[str, int, int]]:
             functions.append((node.name, start, end))
     return functions
 
-def extract_changed_lines(patch: str) -> Set[int]:
-    """Return set of line numbers changed in new file from patch text."""
+def extract_changed_lines(patch: bytes) -> Set[int]:
+    """Return set of line numbers changed in new file from raw patch bytes.
+
+    Only hunk headers and ``+``/``-`` lines are matched; the context lines
+    in between are counted with ``bytes.count`` instead of a Python loop.
+    """
     changed: Set[int] = set()
     new_line = 0
-    for line in patch.splitlines():
-        if line.startswith('@@'):
-            m = re.search(r"\+(\d+)(?:,(\d+))?", line)
-            if m:
+    line_start = 0
+    for m in _PATCH_LINE.finditer(patch):
+        start = m.start()
+        new_line += patch.count(b'\n', line_start, start)
+        line_start = patch.find(b'\n', start) + 1
+        kind = patch[start]
+        if kind == 0x40:  # '@'
+            if m.group(1):
                 new_line = int(m.group(1)) - 1
-        elif line.startswith('+'):
+        elif kind == 0x2b:  # '+'
             new_line += 1
             changed.add(new_line)
-        elif line.startswith('-'):
+        else:
             # deletion: consider previous line number
             changed.add(new_line + 1)
-        else:
-            new_line += 1
     return changed
 
-def scan_todos(repo_path: str) -> List[Dict[str, str]]:
+def _scan_todos_rg(rg: str, repo_path: str) -> Optional[List[Dict[str, str]]]:
+    """Scan with ripgrep; return ``None`` if it fails so callers can fall back."""
+    # --no-config keeps user defaults out of the parsed output; hidden files
+    # are searched but hidden directories pruned, like the fallback walk.
+    cmd = [rg, '--no-config', '--no-heading', '--line-number', '--null', '--no-ignore',
+           '--hidden', '--ignore-case', '--glob', '*.py', '--glob', '!.*/']
+    for d in SKIP_DIRS:
+        cmd += ['--glob', f'!{d}/']
+    cmd += ['-e', TODO_PATTERN.pattern, '--', '.']
+    try:
+        proc = subprocess.run(cmd, cwd=repo_path, capture_output=True, stdin=subprocess.DEVNULL)
+    except OSError:
+        return None
+    if proc.returncode not in (0, 1):  # 1 means no matches
+        return None
+    todos = []
+    for record in proc.stdout.decode('utf-8', errors='replace').splitlines():
+        path, _, rest = record.partition('\0')
+        lineno, _, text = rest.partition(':')
+        todos.append({'file': os.path.normpath(path), 'line': int(lineno), 'text': text.strip()})
+    return todos
+
+
+def _scan_file(full: str, repo_path: str) -> List[Dict[str, str]]:
+    """Return TODO entries of one file using a single regex pass over its bytes.
+
+    Markers are ASCII, so the raw bytes are searched and only matched lines
+    are decoded.
+    """
+    rel = os.path.relpath(full, repo_path)
+    try:
+        with open(full, 'rb') as fh:
+            data = fh.read()
+    except OSError:
+        return []
     todos = []
-    skip_dirs = {".git", "venv", "node_modules", ".venv", "__pycache__"}
-    for root, dirs, files in os.walk(repo_path):
-        # prune directories we don't want to scan
-        dirs[:] = [d for d in dirs if d not in skip_dirs and not d.startswith('.')]
-        for fname in files:
-            if fname.endswith('.py'):
-                full = os.path.join(root, fname)
-                rel = os.path.relpath(full, repo_path)
-                try:
-                    with open(full, 'r', encoding='utf-8') as fh:
-                        for i, line in enumerate(fh, 1):
-                            if TODO_PATTERN.search(line):
-                                todos.append({'file': rel, 'line': i, 'text': line.strip()})
-                except OSError:
-                    continue
+    line_no = 1
+    pos = 0
+    for m in TODO_PATTERN_B.finditer(data):
+        start = data.rfind(b'\n', 0, m.start()) + 1
+        line_no += data.count(b'\n', pos, start)
+        pos = start
+        end = data.find(b'\n', m.end())
+        line = data[start:] if end == -1 else data[start:end]
+        todos.append({'file': rel, 'line': line_no, 'text': line.decode('utf-8', errors='replace').strip()})
     return todos
 
-def analyze_repository(repo_path: str) -> Dict[str, List]:
+
+def scan_todos(repo_path: str) -> List[Dict[str, str]]:
+    """Return TODO/FIXME comments in Python files, ordered by file and line.
+
+    ripgrep is used when it is on ``PATH``; otherwise each file is scanned
+    with one ``finditer`` over its whole text.  Files are read on a thread
+    pool since the GIL is released while waiting on I/O.
+    """
+    rg = shutil.which('rg')
+    todos = _scan_todos_rg(rg, repo_path) if rg else None
+    if todos is None:
+        paths = list(iter_py_files(repo_path, prune=SKIP_DIRS))
+        todos = []
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+            for found in ex.map(partial(_scan_file, repo_path=repo_path), paths):
+                todos.extend(found)
+    todos.sort(key=itemgetter('file', 'line'))
+    return todos
+
+
+def _function_index(functions: List[Tuple[str, int, int]]) -> Tuple[List[int], List[int], List[Tuple[int, int, int, str]]]:
+    """Return ``(starts, reach, ranges)`` for looking functions up by line.
+
+    ``ranges`` holds ``(start, end, order, name)`` sorted by start line,
+    where ``order`` is the position in ``functions``.  ``starts`` lists the
+    start lines and ``reach[i]`` is the furthest end line of ``ranges[:i + 1]``.
+    """
+    ranges = sorted((start, end, order, name) for order, (name, start, end) in enumerate(functions))
+    starts = [r[0] for r in ranges]
+    reach = list(accumulate((r[1] for r in ranges), max))
+    return starts, reach, ranges
+
+
+def _functions_at(index, line: int) -> List[str]:
+    """Return names of the functions spanning ``line`` in their original order.
+
+    Bisecting on start lines finds the last candidate; walking back stops as
+    soon as no earlier function reaches ``line``, so nested functions are
+    found without testing every range.
+    """
+    starts, reach, ranges = index
+    i = bisect_right(starts, line)
+    found = []
+    while i and reach[i - 1] >= line:
+        i -= 1
+        _start, end, order, name = ranges[i]
+        if end >= line:
+            found.append((order, name))
+    if len(found) > 1:
+        found.sort()
+    return [name for _order, name in found]
+
+
+def _blob_function_index(blob):
+    """Return the :func:`_function_index` of ``blob``, memoized by its git object sha.
+
+    Identical file versions share a blob sha, so unchanged files, merges and
+    reverts are read and parsed only once per process.
+    """
+    sha = blob.hexsha
+    index = _RANGES_CACHE.get(sha)
+    if index is not None:
+        _RANGES_CACHE.move_to_end(sha)
+        return index
+    source = blob.data_stream.read().decode('utf-8', errors='ignore')
+    index = _function_index(get_function_ranges(source))
+    _RANGES_CACHE[sha] = index
+    if len(_RANGES_CACHE) > _RANGES_CACHE_SIZE:
+        _RANGES_CACHE.popitem(last=False)
+    return index
+
+
+def _numstat_files(numstat: str) -> List[str]:
+    """Return the unique paths listed in ``--numstat`` output, in order."""
+    files = []
+    for line in numstat.split('\n'):
+        if line:
+            files.append(line.split('\t', 2)[2].strip())
+    return list(dict.fromkeys(files))
+
+
+def _parse_log_record(record: str) -> Tuple[str, List[str], str, str, List[str]]:
+    """Return ``(sha, parents, month, message, files)`` of one log record."""
+    sha, parents, date, message, numstat = record.split('\x1f')
+    return sha, parents.split(), date[:7], message, _numstat_files(numstat)
+
+
+def _supports_diff_merges(repo) -> bool:
+    """Return whether git understands ``--diff-merges`` (added in git 2.31)."""
+    return repo.git.version_info >= (2, 31)
+
+
+def _iter_commit_log(repo, rev: str = 'HEAD') -> Iterator[Tuple[str, str, str, List[str]]]:
+    """Yield ``(sha, month, message, files)`` for every commit in ``rev``.
+
+    The whole history comes from one streamed ``git log --numstat`` instead
+    of a ``git diff --numstat`` per commit.  Files are listed against the
+    first parent without rename detection, exactly like ``Commit.stats``.
+    Git older than 2.31 lists no files for merges, so those few are diffed
+    separately.
+    """
+    diff_merges = _supports_diff_merges(repo)
+    args = ['--format=%x1e%H%x1f%P%x1f%cI%x1f%B%x1f', '--numstat', '--no-renames']
+    if diff_merges:
+        args.append('--diff-merges=first-parent')
+    proc = repo.git.log(*args, rev, as_process=True)
+
+    def entry(record: str) -> Tuple[str, str, str, List[str]]:
+        sha, parents, month, message, files = _parse_log_record(record)
+        if len(parents) > 1 and not diff_merges:
+            files = _numstat_files(repo.git.diff('--numstat', '--no-renames', parents[0], sha))
+        return sha, month, message, files
+
+    reader = io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='replace')
+    pending = ''
+    for chunk in iter(partial(reader.read, 1 << 16), ''):
+        *records, pending = (pending + chunk).split('\x1e')
+        for record in records:
+            if record:
+                yield entry(record)
+    if pending:
+        yield entry(pending)
+    proc.wait()
+
+
+def _touches_python(files: List[str]) -> bool:
+    """Return whether any of ``files`` (possibly C-quoted by git) is a .py file."""
+    return any(f.endswith(('.py', '.py"')) for f in files)
+
+
+def _test_failure(sha: str, message: str) -> Optional[Dict[str, str]]:
+    """Return a test failure record if ``message`` reads like a test fix."""
+    if _TEST_WORD.search(message) and _FAILURE_WORD.search(message):
+        return {'commit': sha, 'message': message.strip()}
+    return None
+
+
+def _function_hits(commit) -> List[Tuple[str, str]]:
+    """Return ``(path, function)`` pairs whose lines ``commit`` changed."""
+    # The pathspec lets git leave other files out of the patch entirely.
+    if commit.parents:
+        diffs = commit.parents[0].diff(commit, paths='*.py', create_patch=True)
+    else:
+        diffs = commit.diff(NULL_TREE, paths='*.py', create_patch=True)
+
+    hits: List[Tuple[str, str]] = []
+    for diff in diffs:
+        path = diff.b_path or diff.a_path
+        if not path or not path.endswith('.py'):
+            continue
+        # The diff already carries the new blob; it is None for deletions and
+        # for the reversed root-commit diff, whose patch has no new lines.
+        blob = diff.b_blob
+        if blob is None:
+            continue
+        try:
+            index = _blob_function_index(blob)
+        except Exception:
+            continue
+        changed_lines = extract_changed_lines(diff.diff)
+        for line in changed_lines:
+            hits.extend((path, name) for name in _functions_at(index, line))
+    return hits
+
+
+_WORKER_REPO: Optional[Repo] = None
+
+
+def _init_worker(repo_path: str) -> None:
+    """Open the repository once per worker process, or once for a serial run."""
+    global _WORKER_REPO
+    _WORKER_REPO = Repo(repo_path)
+
+
+def _process_commit(sha: str) -> List[Tuple[str, str]]:
+    """Worker entry point: return function hits of commit ``sha``."""
+    return _function_hits(_WORKER_REPO.commit(sha))
+
+
+def _load_cache(cache_path: str, repo) -> Optional[Dict[str, Any]]:
+    """Return the cached history state if HEAD still descends from its commit."""
+    try:
+        with open(cache_path, 'rb') as fh:
+            cache = loads(fh.read())
+        if cache.get('version') != _CACHE_VERSION or not repo.is_ancestor(cache['head'], 'HEAD'):
+            return None
+    except (OSError, ValueError, KeyError, GitCommandError):
+        return None
+    return cache
+
+
+def _save_cache(cache_path: str, head: str, file_commit_counts, temporal_churn,
+                test_failures, function_commits) -> None:
+    """Persist the history state reached at commit ``head``."""
+    cache = {
+        'version': _CACHE_VERSION,
+        'head': head,
+        'file_commit_counts': file_commit_counts,
+        'temporal_churn': temporal_churn,
+        'test_failures': test_failures,
+        'function_commits': [[f, func, sorted(shas)] for (f, func), shas in function_commits.items()],
+    }
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with open(cache_path, 'wb') as fh:
+        fh.write(dumpb(cache))
+
+
+def analyze_repository(repo_path: str, *, max_workers: Optional[int] = None,
+                       cache_path: Optional[str] = None) -> Dict[str, List]:
+    """Mine churn, function edits, test failures and TODOs from ``repo_path``.
+
+    With ``cache_path`` the history state is saved there together with the
+    HEAD commit, and later runs only walk commits added since then.  The
+    cache is rebuilt from scratch if HEAD no longer descends from it.
+    """
     repo = Repo(repo_path)
+    head = repo.head.commit.hexsha
+    cache = _load_cache(cache_path, repo) if cache_path else None
     file_commit_counts: Dict[str, int] = defaultdict(int)
     function_commits: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
     test_failures: List[Dict[str, str]] = []
     temporal_churn: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
 
-    for commit in repo.iter_commits():
-        month = commit.committed_datetime.strftime("%Y-%m")
-        for path in commit.stats.files.keys():
+    # Churn and test failures are counted while the log streams in; only
+    # commits touching Python files need the diff and AST work afterwards.
+    py_shas = []
+    rev = f"{cache['head']}..{head}" if cache else head
+    for sha, month, message, files in _iter_commit_log(repo, rev):
+        for path in files:
             file_commit_counts[path] += 1
             temporal_churn[path][month] += 1
+        failure = _test_failure(sha, message)
+        if failure is not None:
+            test_failures.append(failure)
+        if _touches_python(files):
+            py_shas.append(sha)
 
-        msg_lower = commit.message.lower()
-        if 'test' in msg_lower and ('fail' in msg_lower or 'fix' in msg_lower or 'broken' in msg_lower):
-            test_failures.append({'commit': commit.hexsha, 'message': commit.message.strip()})
+    # Commits are independent and ast.parse holds the GIL, so larger
+    # histories are spread over processes; each worker opens its own Repo.
+    results = map_in_processes(
+        _process_commit,
+        py_shas,
+        min_items=_PARALLEL_MIN_COMMITS,
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(repo_path,),
+        chunksize=32,
+    )
 
-        if commit.parents:
-            diffs = commit.parents[0].diff(commit, create_patch=True)
-        else:
-            diffs = commit.diff(NULL_TREE, create_patch=True)
-
-        for diff in diffs:
-            path = diff.b_path or diff.a_path
-            if not path or not path.endswith('.py'):
-                continue
-            try:
-                blob = commit.tree / path
-                source = blob.data_stream.read().decode('utf-8', errors='ignore')
-            except Exception:
-                continue
-            functions = get_function_ranges(source)
-            patch_text = diff.diff.decode('utf-8', errors='ignore')
-            changed_lines = extract_changed_lines(patch_text)
-            for line in changed_lines:
-                for name, start, end in functions:
-                    if start <= line <= end:
-                        function_commits[(path, name)].add(commit.hexsha)
+    for sha, hits in zip(py_shas, results):
+        for key in hits:
+            function_commits[key].add(sha)
+
+    # Cached commits are older than the new ones, so merging them afterwards
+    # keeps the first-seen order a full walk would give.
+    if cache:
+        for path, count in cache['file_commit_counts'].items():
+            file_commit_counts[path] += count
+        for path, months in cache['temporal_churn'].items():
+            churn = temporal_churn[path]
+            for month, count in months.items():
+                churn[month] += count
+        test_failures.extend(cache['test_failures'])
+        for path, func, shas in cache['function_commits']:
+            function_commits[(path, func)].update(shas)
+    if cache_path and (cache is None or cache['head'] != head):
+        _save_cache(cache_path, head, file_commit_counts, temporal_churn,
+                    test_failures, function_commits)
 
     high_churn_files = sorted(
         [{'file': f, 'commit_count': c} for f, c in file_commit_counts.items()],
@@ -18,7 +18,10 @@ def main() -> None:
     args = parser.parse_args()
 
     try:
-        data = analyze_repository(args.repo_path)
+        data = analyze_repository(
+            args.repo_path,
+            cache_path=str(Path(args.repo_path) / '.aether' / 'analyzer_cache.json'),
+        )
     except (git.exc.InvalidGitRepositoryError, FileNotFoundError):
         print(f"Error: {args.repo_path} is not a valid Git repository.", file=sys.stderr)
         sys.exit(1)
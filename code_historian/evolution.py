@@ -7,22 +7,30 @@ from git import Repo
 def compute_risk_map(repo_path: str, data: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
     """Assign a risk score to each Python file in the repository."""
     repo = Repo(repo_path)
-    files = [f for f in repo.git.ls_files().splitlines() if f.endswith('.py')]
+    # git filters by pathspec, and -z output needs no unquoting or line splitting
+    files = [f for f in repo.git.ls_files('-z', '--', '*.py').split('\0') if f]
     commit_counts = data.get('file_commit_counts', {})
     function_counts = data.get('function_edit_counts', {})
     todo_counts = data.get('todo_counts', {})
 
-    max_commit = max(commit_counts.values(), default=1)
-    max_function = max(function_counts.values(), default=1)
-    max_todo = max(todo_counts.values(), default=1)
+    # Counts are non-negative, so an all-zero column can divide by 1 for the
+    # same 0.0 factors instead of testing each divisor for every file.
+    max_commit = max(commit_counts.values(), default=1) or 1
+    max_function = max(function_counts.values(), default=1) or 1
+    max_todo = max(todo_counts.values(), default=1) or 1
+
+    names = [os.path.basename(f) for f in files]
+    stems = [name.replace('.py', '') for name in names]
+    # All test file names joined by NUL: one substring search checks every
+    # name at once, and a stem never holds NUL so a match can't span two.
+    test_names = '\0'.join({name for name in names if 'test' in name})
 
     risk_map: Dict[str, Dict[str, float]] = {}
-    for f in files:
-        commit_factor = commit_counts.get(f, 0) / max_commit if max_commit else 0.0
-        function_factor = function_counts.get(f, 0) / max_function if max_function else 0.0
-        todo_factor = todo_counts.get(f, 0) / max_todo if max_todo else 0.0
-        base = os.path.basename(f).replace('.py', '')
-        has_tests = any(base in os.path.basename(tf) and 'test' in os.path.basename(tf) for tf in files)
+    for f, base in zip(files, stems):
+        commit_factor = commit_counts.get(f, 0) / max_commit
+        function_factor = function_counts.get(f, 0) / max_function
+        todo_factor = todo_counts.get(f, 0) / max_todo
+        has_tests = bool(test_names) and base in test_names
         test_factor = 0.0 if has_tests else 1.0
         risk = (commit_factor + function_factor + todo_factor + test_factor) / 4.0
         risk_map[f] = {
@@ -52,11 +60,11 @@ def generate_evolution_log(risk_map: Dict[str, Dict[str, float]], todos: List[Di
             reason_text = ', '.join(reasons) if reasons else 'elevated risk'
             suggestions.append({'file': path, 'risk': metrics['risk'], 'reason': reason_text})
 
-    todo_priorities: List[Dict[str, Any]] = []
-    for todo in todos:
-        score = risk_map.get(todo['file'], {}).get('risk', 0.0)
-        todo_priorities.append({**todo, 'risk': score})
-    todo_priorities.sort(key=lambda x: x['risk'], reverse=True)
+    # Sort indices on a plain list of risks so the key is a C-level lookup;
+    # the sort stays stable, keeping scan order within equal risk.
+    risks = [risk_map.get(todo['file'], {}).get('risk', 0.0) for todo in todos]
+    order = sorted(range(len(todos)), key=risks.__getitem__, reverse=True)
+    todo_priorities: List[Dict[str, Any]] = [{**todos[i], 'risk': risks[i]} for i in order]
 
     return {
         'suggestions': suggestions,
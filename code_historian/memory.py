@@ -1,8 +1,9 @@
-import json
 import os
 import shutil
 from typing import Any, Dict
 
+from aether.jsonio import dumpb
+
 
 def save_memory(repo_path: str, report_dir: str, evolution_log: Dict[str, Any], risk_map: Dict[str, Dict[str, float]]) -> None:
     """Persist historian outputs and evolution data to .aether directory."""
@@ -21,7 +22,7 @@ def save_memory(repo_path: str, report_dir: str, evolution_log: Dict[str, Any],
         if os.path.exists(src_md):
             shutil.copy(src_md, dst_md)
 
-    with open(os.path.join(memory_dir, 'evolution_log.json'), 'w', encoding='utf-8') as ef:
-        json.dump(evolution_log, ef, indent=2)
-    with open(os.path.join(memory_dir, 'risk_map.json'), 'w', encoding='utf-8') as rf:
-        json.dump(risk_map, rf, indent=2)
+    with open(os.path.join(memory_dir, 'evolution_log.json'), 'wb') as ef:
+        ef.write(dumpb(evolution_log, indent=True))
+    with open(os.path.join(memory_dir, 'risk_map.json'), 'wb') as rf:
+        rf.write(dumpb(risk_map, indent=True))
@@ -1,6 +1,11 @@
-import json
+import io
 import os
-from typing import Any, Dict, List
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List
+
+from aether.jsonio import dumpb
 
 SPARK_CHARS = "▁▂▃▄▅▆▇"
 
@@ -12,78 +17,96 @@ def sparkline(values: List[int]) -> str:
     if max_val == 0:
         return ""
     scale = len(SPARK_CHARS) - 1
-    return ''.join(SPARK_CHARS[int(v / max_val * scale)] for v in values)
+    # counts are ints, so floor division gives the bar without float math
+    return ''.join([SPARK_CHARS[v * scale // max_val] for v in values])
 
 
-def generate_reports(data: Dict[str, Any], output_dir: str) -> None:
-    json_path = os.path.join(output_dir, "historian_report.json")
-    md_path = os.path.join(output_dir, "historian_report.md")
-    os.makedirs(output_dir, exist_ok=True)
+def _write_table(buf: io.StringIO, header: str, rows: Iterator[str], empty: str) -> None:
+    """Write ``header`` and ``rows`` to ``buf``, or ``empty`` if there are no rows."""
+    body = ''.join(rows)
+    buf.write(header + body if body else empty)
+
+
+def _write_json(data: Dict[str, Any], json_path: str) -> None:
+    with open(json_path, 'wb') as jf:
+        jf.write(dumpb(data, indent=True))
+
+
+def _write_markdown(data: Dict[str, Any], md_path: str) -> None:
+    buf = io.StringIO()
+    buf.write("# Code Historian Report\n")
+
+    buf.write("## High Churn Files\n")
+    _write_table(
+        buf, '| File | Commit Count |\n| --- | ---: |\n',
+        (f"| {item['file']} | {item['commit_count']} |\n" for item in data['high_churn_files']),
+        'No file changes detected.\n',
+    )
 
-    with open(json_path, 'w', encoding='utf-8') as jf:
-        json.dump(data, jf, indent=2)
-
-    lines = ["# Code Historian Report\n"]
-
-    lines.append("## High Churn Files\n")
-    if data['high_churn_files']:
-        lines.append('| File | Commit Count |\n')
-        lines.append('| --- | ---: |\n')
-        for item in data['high_churn_files']:
-            lines.append(f"| {item['file']} | {item['commit_count']} |\n")
-    else:
-        lines.append('No file changes detected.\n')
-
-    lines.append('\n## Functions with 3+ Changes\n')
-    if data['high_churn_functions']:
-        lines.append('| File | Function | Commit Count |\n')
-        lines.append('| --- | --- | ---: |\n')
-        for item in data['high_churn_functions']:
-            lines.append(f"| {item['file']} | {item['function']} | {item['commit_count']} |\n")
-    else:
-        lines.append('No functions with 3+ changes.\n')
-
-    lines.append('\n## TODOs / FIXMEs\n')
-    if data['todos']:
-        lines.append('| File | Line | Text |\n')
-        lines.append('| --- | ---: | --- |\n')
-        for todo in data['todos']:
-            lines.append(f"| {todo['file']} | {todo['line']} | {todo['text']} |\n")
-    else:
-        lines.append('No TODOs or FIXMEs found.\n')
-
-    lines.append('\n## Test Failures\n')
-    if data['test_failures']:
-        lines.append('| Commit | Message |\n')
-        lines.append('| --- | --- |\n')
-        for t in data['test_failures']:
-            lines.append(f"| {t['commit']} | {t['message']} |\n")
-    else:
-        lines.append('No test failures found.\n')
-
-    lines.append('\n## Temporal Churn\n')
+    buf.write('\n## Functions with 3+ Changes\n')
+    _write_table(
+        buf, '| File | Function | Commit Count |\n| --- | --- | ---: |\n',
+        (f"| {item['file']} | {item['function']} | {item['commit_count']} |\n"
+         for item in data['high_churn_functions']),
+        'No functions with 3+ changes.\n',
+    )
+
+    buf.write('\n## TODOs / FIXMEs\n')
+    _write_table(
+        buf, '| File | Line | Text |\n| --- | ---: | --- |\n',
+        (f"| {todo['file']} | {todo['line']} | {todo['text']} |\n" for todo in data['todos']),
+        'No TODOs or FIXMEs found.\n',
+    )
+
+    buf.write('\n## Test Failures\n')
+    _write_table(
+        buf, '| Commit | Message |\n| --- | --- |\n',
+        (f"| {t['commit']} | {t['message']} |\n" for t in data['test_failures']),
+        'No test failures found.\n',
+    )
+
+    buf.write('\n## Temporal Churn\n')
+    temporal_churn = data['temporal_churn']
     for item in data['high_churn_files']:
         file_path = item['file']
-        churn = data['temporal_churn'].get(file_path, {})
+        churn = temporal_churn.get(file_path)
         if not churn:
             continue
         months = sorted(churn.items())
         counts = [count for _, count in months]
         spark = sparkline(counts)
-        top_month, top_count = max(churn.items(), key=lambda x: x[1])
-        lines.append(f"File: {file_path}\n")
-        lines.append(f"Monthly Churn: {spark}\n")
-        lines.append(f"Top Month: {top_month} ({top_count} commits)\n\n")
+        top_month, top_count = max(churn.items(), key=itemgetter(1))
+        buf.write(
+            f"File: {file_path}\n"
+            f"Monthly Churn: {spark}\n"
+            f"Top Month: {top_month} ({top_count} commits)\n\n"
+        )
 
-    lines.append('\n## Summary\n')
+    buf.write('\n## Summary\n')
+    funcs_by_file = defaultdict(list)
+    for f in data['high_churn_functions']:
+        funcs_by_file[f['file']].append(f)
     for file_item in data['high_churn_files']:
         file_path = file_item['file']
         summary = f"{file_path} changed {file_item['commit_count']} times."
-        funcs = [f for f in data['high_churn_functions'] if f['file'] == file_path]
+        funcs = funcs_by_file.get(file_path)
         if funcs:
             func_desc = ', '.join(f"{f['function']} ({f['commit_count']})" for f in funcs)
             summary += f" Functions changed: {func_desc}."
-        lines.append(f"- {summary}\n")
+        buf.write(f"- {summary}\n")
 
     with open(md_path, 'w', encoding='utf-8') as mf:
-        mf.writelines(lines)
+        mf.write(buf.getvalue())
+
+
+def generate_reports(data: Dict[str, Any], output_dir: str) -> None:
+    json_path = os.path.join(output_dir, "historian_report.json")
+    md_path = os.path.join(output_dir, "historian_report.md")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # The JSON file is independent of the Markdown one, so it is encoded and
+    # written on a helper thread while the Markdown report is built here.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        json_done = ex.submit(_write_json, data, json_path)
+        _write_markdown(data, md_path)
+        json_done.result()
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure package root on path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aether.ai_refactorer import AIRefactorer, FunctionContext, LLMError
+
+
+def _refactorer(tmp_path: Path, monkeypatch, responses: list) -> AIRefactorer:
+    config = tmp_path / ".aether" / "config.json"
+    config.parent.mkdir(exist_ok=True)
+    config.write_text(json.dumps({"llm_backend": "openai:gpt-4"}))
+    refactorer = AIRefactorer(config)
+
+    def fake_request(prompt: str) -> str:
+        responses.append(prompt)
+        return json.dumps({"outline": "split it", "name": "better", "docstring": "Doc."})
+
+    monkeypatch.setattr(refactorer, "_request", fake_request)
+    return refactorer
+
+
+def test_suggest_refactor_uses_cache(tmp_path: Path, monkeypatch) -> None:
+    prompts: list = []
+    refactorer = _refactorer(tmp_path, monkeypatch, prompts)
+    ctx = FunctionContext("foo", "def foo():\n    bar()\n", "", ["bar"], 0.9)
+
+    first = refactorer.suggest_refactor(ctx)
+    second = refactorer.suggest_refactor(ctx)
+
+    assert first == second
+    assert first.new_name == "better"
+    assert len(prompts) == 1
+    assert refactorer.stats == {"hits": 1, "misses": 1}
+    assert (tmp_path / ".aether" / "llm_cache.sqlite").exists()
+
+    # A fresh client reuses the on-disk cache
+    prompts.clear()
+    again = _refactorer(tmp_path, monkeypatch, prompts)
+    assert again.suggest_refactor(ctx) == first
+    assert prompts == []
+
+
+def test_suggest_refactor_many(tmp_path: Path, monkeypatch) -> None:
+    prompts: list = []
+    refactorer = _refactorer(tmp_path, monkeypatch, prompts)
+    refactorer.config["max_calls_per_run"] = 2
+    ctxs = [
+        FunctionContext(f"f{i}", f"def f{i}():\n    pass\n", "", [], 0.8) for i in range(3)
+    ]
+    refactorer.suggest_refactor(ctxs[2])
+    prompts.clear()
+
+    suggestions = asyncio.run(refactorer.suggest_refactor_many(ctxs, concurrency=2))
+
+    assert len(suggestions) == 3
+    assert len(prompts) == 2
+    assert refactorer.stats == {"hits": 1, "misses": 3}
+
+
+def test_suggest_refactor_many_keeps_capped_positions(tmp_path: Path, monkeypatch) -> None:
+    prompts: list = []
+    refactorer = _refactorer(tmp_path, monkeypatch, prompts)
+    refactorer.config["max_calls_per_run"] = 1
+    ctxs = [
+        FunctionContext(name, f"def {name}():\n    pass\n", "", [], 0.8) for name in "abc"
+    ]
+    cached = refactorer.suggest_refactor(ctxs[2])
+    prompts.clear()
+
+    suggestions = asyncio.run(refactorer.suggest_refactor_many(ctxs))
+
+    assert len(suggestions) == 3
+    assert suggestions[0] is not None
+    assert suggestions[1] is None
+    assert suggestions[2] == cached
+    assert len(prompts) == 1
+    assert refactorer.stats == {"hits": 1, "misses": 2}
+
+
+def test_semantic_cache_reuses_similar_function(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    prompts: list = []
+    config = tmp_path / ".aether" / "config.json"
+    config.parent.mkdir()
+    config.write_text(
+        json.dumps({"llm_backend": "openai:gpt-4", "embedding_backend": "openai:embed"})
+    )
+    refactorer = AIRefactorer(config)
+    monkeypatch.setattr(
+        refactorer, "_request", lambda prompt: prompts.append(prompt) or '{"outline": "x"}'
+    )
+    vectors = {"def a():\n    pass\n": [1.0, 0.0], "def  a():\n    pass\n": [0.99, 0.05]}
+    monkeypatch.setattr(
+        refactorer, "_embed", lambda texts: [vectors.get(t, [0.0, 1.0]) for t in texts]
+    )
+
+    first = refactorer.suggest_refactor(FunctionContext("a", "def a():\n    pass\n", "", [], 0.9))
+    near = refactorer.suggest_refactor(FunctionContext("a", "def  a():\n    pass\n", "", [], 0.9))
+    refactorer.suggest_refactor(FunctionContext("b", "def b():\n    return 1\n", "", [], 0.9))
+
+    assert near == first
+    assert len(prompts) == 2
+    assert (tmp_path / ".aether" / "llm_embeddings.f32").exists()
+
+
+def _semantic_refactorer(tmp_path: Path, monkeypatch, backend: str, embedding: str, prompts: list):
+    config = tmp_path / ".aether" / "config.json"
+    config.parent.mkdir(exist_ok=True)
+    config.write_text(json.dumps({"llm_backend": backend, "embedding_backend": embedding}))
+    refactorer = AIRefactorer(config)
+    monkeypatch.setattr(
+        refactorer, "_request", lambda prompt: prompts.append(prompt) or '{"outline": "x"}'
+    )
+    return refactorer
+
+
+def test_suggest_refactor_many_embeds_misses_in_one_call(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    prompts: list = []
+    refactorer = _semantic_refactorer(tmp_path, monkeypatch, "openai:gpt-4", "openai:embed", prompts)
+    vectors = {"def a():\n    pass\n": [1.0, 0.0], "def  a():\n    pass\n": [0.99, 0.05]}
+    batches: list = []
+
+    def embed(texts: list) -> list:
+        batches.append(texts)
+        return [vectors.get(t, [0.0, 1.0]) for t in texts]
+
+    monkeypatch.setattr(refactorer, "_embed", embed)
+    first = refactorer.suggest_refactor(FunctionContext("a", "def a():\n    pass\n", "", [], 0.9))
+    batches.clear()
+    ctxs = [
+        FunctionContext("a", "def a():\n    pass\n", "", [], 0.9),
+        FunctionContext("a", "def  a():\n    pass\n", "", [], 0.9),
+        FunctionContext("b", "def b():\n    return 1\n", "", [], 0.9),
+    ]
+
+    suggestions = asyncio.run(refactorer.suggest_refactor_many(ctxs))
+
+    assert batches == [["def  a():\n    pass\n", "def b():\n    return 1\n"]]
+    assert suggestions[:2] == [first, first]
+    assert len(prompts) == 2
+    assert refactorer.stats == {"hits": 2, "misses": 2}
+
+def test_semantic_index_rebuilt_for_new_embedding(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    prompts: list = []
+    old = _semantic_refactorer(tmp_path, monkeypatch, "openai:gpt-4", "openai:big", prompts)
+    monkeypatch.setattr(old, "_embed", lambda texts: [[1.0, 0.0, 0.0] for _ in texts])
+    old.suggest_refactor(FunctionContext("a", "def a():\n    pass\n", "", [], 0.9))
+
+    new = _semantic_refactorer(tmp_path, monkeypatch, "openai:gpt-4", "openai:small", prompts)
+    monkeypatch.setattr(new, "_embed", lambda texts: [[1.0, 0.0] for _ in texts])
+    new.suggest_refactor(FunctionContext("b", "def b():\n    pass\n", "", [], 0.9))
+    new.suggest_refactor(FunctionContext("c", "def c():\n    pass\n", "", [], 0.9))
+
+    assert len(prompts) == 2
+    header = (tmp_path / ".aether" / "llm_embeddings.jsonl").read_text().splitlines()[0]
+    assert json.loads(header) == {"embedding": "openai:small", "dim": 2}
+
+
+def test_semantic_index_separates_models_and_appends(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    prompts: list = []
+    first = _semantic_refactorer(tmp_path, monkeypatch, "openai:gpt-4", "openai:embed", prompts)
+    monkeypatch.setattr(first, "_embed", lambda texts: [[1.0, 0.0] for _ in texts])
+    first.suggest_refactor(FunctionContext("a", "def a():\n    pass\n", "", [], 0.9))
+    vectors = tmp_path / ".aether" / "llm_embeddings.f32"
+    size = vectors.stat().st_size
+
+    other = _semantic_refactorer(tmp_path, monkeypatch, "openai:gpt-3.5", "openai:embed", prompts)
+    monkeypatch.setattr(other, "_embed", lambda texts: [[1.0, 0.0] for _ in texts])
+    other.suggest_refactor(FunctionContext("b", "def b():\n    pass\n", "", [], 0.9))
+
+    assert len(prompts) == 2
+    assert vectors.stat().st_size == 2 * size
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, payload: dict) -> None:
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+@pytest.mark.parametrize(
+    "status, payload",
+    [(404, {"error": "model not found"}), (200, {"error": "model not found"})],
+)
+def test_ollama_error_is_raised_and_not_cached(tmp_path: Path, monkeypatch, status, payload) -> None:
+    config = tmp_path / ".aether" / "config.json"
+    config.parent.mkdir()
+    config.write_text(json.dumps({"llm_backend": "ollama:missing"}))
+    refactorer = AIRefactorer(config)
+
+    class _Session:
+        def post(self, *args, **kwargs) -> _FakeResponse:
+            return _FakeResponse(status, payload)
+
+    monkeypatch.setattr(refactorer, "_http_session", lambda: _Session())
+    ctx = FunctionContext("foo", "def foo():\n    pass\n", "", [], 0.9)
+
+    with pytest.raises(LLMError):
+        refactorer.suggest_refactor(ctx)
+    assert refactorer._cache.get(refactorer._cache_key(ctx, [])) is None
+
+
+@pytest.mark.parametrize(
+    "status, payload",
+    [(500, {"error": "model not found"}), (200, {"error": "model not found"}), (200, {})],
+)
+def test_ollama_embedding_error_is_raised(tmp_path: Path, monkeypatch, status, payload) -> None:
+    config = tmp_path / ".aether" / "config.json"
+    config.parent.mkdir()
+    config.write_text(json.dumps({"embedding_backend": "ollama:missing"}))
+    refactorer = AIRefactorer(config)
+
+    class _Session:
+        def post(self, *args, **kwargs) -> _FakeResponse:
+            return _FakeResponse(status, payload)
+
+    monkeypatch.setattr(refactorer, "_http_session", lambda: _Session())
+
+    with pytest.raises(LLMError):
+        refactorer._embed(["def foo():\n    pass\n"])
+
+def test_suggest_refactor_many_sends_one_request_per_key(tmp_path: Path, monkeypatch) -> None:
+    prompts: list = []
+    refactorer = _refactorer(tmp_path, monkeypatch, prompts)
+    refactorer.config["max_calls_per_run"] = 2
+    same = FunctionContext("a", "def a():\n    pass\n", "", [], 0.8)
+    other = FunctionContext("b", "def b():\n    pass\n", "", [], 0.8)
+
+    suggestions = asyncio.run(refactorer.suggest_refactor_many([same, same, other]))
+
+    assert len(prompts) == 2
+    assert suggestions[0] is suggestions[1]
+    assert suggestions[2] is not None
+    assert refactorer.stats == {"hits": 0, "misses": 2}
+
+
+def test_suggest_refactor_many_finishes_batch_before_raising(tmp_path: Path, monkeypatch) -> None:
+    prompts: list = []
+    refactorer = _refactorer(tmp_path, monkeypatch, prompts)
+    ctxs = [FunctionContext(f"f{i}", f"def f{i}():\n    pass\n", "", [], 0.8) for i in range(3)]
+
+    def request(prompt: str) -> str:
+        if "def f0" in prompt:
+            raise LLMError("boom")
+        time.sleep(0.05)  # still in flight when the sibling fails
+        prompts.append(prompt)
+        return json.dumps({"outline": "ok"})
+
+    monkeypatch.setattr(refactorer, "_request", request)
+
+    with pytest.raises(LLMError):
+        asyncio.run(refactorer.suggest_refactor_many(ctxs))
+
+    # The successful siblings were completed and cached despite the failure
+    assert len(prompts) == 2
+    prompts.clear()
+    assert refactorer.suggest_refactor(ctxs[1]).outline == "ok"
+    assert prompts == []
@@ -0,0 +1,204 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure package root on path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("git")
+
+from code_historian import analyzer
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_scan_todos_backends_agree(tmp_path: Path, monkeypatch) -> None:
+    if shutil.which("rg") is None:
+        pytest.skip("ripgrep is not installed")
+    _write(tmp_path / "a.py", "x = 1  # TODO: speed up\n\n# fixme later\n")
+    _write(tmp_path / ".e.py", "# FIXME hidden file\n")
+    _write(tmp_path / "sub" / "b.py", "def f():\n    pass  # todo\n")
+    _write(tmp_path / ".hidden" / "c.py", "# TODO skipped\n")
+    _write(tmp_path / "venv" / "d.py", "# TODO skipped\n")
+    _write(tmp_path / "notes.txt", "# TODO not python\n")
+    config = tmp_path / "rgrc"
+    config.write_text("--max-columns=5\n--column\n", encoding="utf-8")
+    monkeypatch.setenv("RIPGREP_CONFIG_PATH", str(config))
+
+    with_rg = analyzer.scan_todos(str(tmp_path))
+    monkeypatch.setattr(analyzer.shutil, "which", lambda name: None)
+    fallback = analyzer.scan_todos(str(tmp_path))
+
+    assert with_rg == fallback
+    assert [(t["file"], t["line"]) for t in fallback] == [
+        (".e.py", 1),
+        ("a.py", 1),
+        ("a.py", 3),
+        (str(Path("sub") / "b.py"), 2),
+    ]
+    assert fallback[1]["text"] == "x = 1  # TODO: speed up"
+
+
+def test_extract_changed_lines() -> None:
+    patch = (
+        b"@@ -1,3 +1,4 @@\n"
+        b" a\n"
+        b"-b\n"
+        b"+B\n"
+        b"+C\n"
+        b" d\n"
+        b"@@ -10,2 +11,2 @@ def f():\n"
+        b" x\n"
+        b"-y\n"
+        b"+z\n"
+        b"\\ No newline at end of file\n"
+    )
+    assert analyzer.extract_changed_lines(patch) == {2, 3, 12}
+
+
+def test_extract_changed_lines_pure_deletion() -> None:
+    patch = b"@@ -4,3 +4,1 @@\n a\n-b\n-c\n"
+    assert analyzer.extract_changed_lines(patch) == {5}
+    assert analyzer.extract_changed_lines(b"") == set()
+
+
+def test_functions_at_nested() -> None:
+    source = (
+        "def outer():\n"
+        "    x = 1\n"
+        "    def inner():\n"
+        "        return x\n"
+        "    return inner\n"
+        "\n"
+        "def other():\n"
+        "    pass\n"
+    )
+    index = analyzer._function_index(analyzer.get_function_ranges(source))
+
+    assert analyzer._functions_at(index, 2) == ["outer"]
+    assert analyzer._functions_at(index, 4) == ["outer", "inner"]
+    assert analyzer._functions_at(index, 6) == []
+    assert analyzer._functions_at(index, 8) == ["other"]
+    assert analyzer._functions_at(index, 99) == []
+
+
+def _git(repo: Path, *args: str) -> str:
+    env = {
+        "GIT_AUTHOR_NAME": "A",
+        "GIT_AUTHOR_EMAIL": "a@example.com",
+        "GIT_COMMITTER_NAME": "A",
+        "GIT_COMMITTER_EMAIL": "a@example.com",
+        "GIT_AUTHOR_DATE": "2024-01-01T00:00:00+00:00",
+        "GIT_COMMITTER_DATE": "2024-01-01T00:00:00+00:00",
+        "HOME": str(repo),
+        "PATH": os.environ.get("PATH", ""),
+    }
+    result = subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True, env=env)
+    return result.stdout.strip()
+
+
+def _commit(repo: Path, n: int, message: str) -> None:
+    body = "".join(f"def f{i}():\n    return {i * n}\n\n" for i in range(3))
+    _write(repo / "pkg" / "mod.py", body)
+    _write(repo / "notes.txt", f"{n}\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+
+
+def _make_repo(tmp_path: Path, commits: int) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    for n in range(commits):
+        _commit(repo, n + 1, "fix failing test" if n % 2 else "update")
+    return repo
+
+
+def test_incremental_run_matches_full_run(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path, 3)
+    cache = tmp_path / "cache.json"
+    analyzer.analyze_repository(str(repo), cache_path=str(cache))
+    for n in range(4, 7):
+        _commit(repo, n, "tests broken" if n % 2 else "more")
+
+    incremental = analyzer.analyze_repository(str(repo), cache_path=str(cache))
+
+    assert incremental == analyzer.analyze_repository(str(repo), max_workers=1)
+    assert incremental["function_edit_counts"] == {"pkg/mod.py": 10}
+
+
+def test_cache_noop_when_head_unchanged(tmp_path: Path, monkeypatch) -> None:
+    repo = _make_repo(tmp_path, 3)
+    cache = tmp_path / "cache.json"
+    first = analyzer.analyze_repository(str(repo), cache_path=str(cache))
+    saved = cache.read_bytes()
+    calls = []
+    monkeypatch.setattr(analyzer, "_function_hits", lambda commit: calls.append(commit) or [])
+
+    assert analyzer.analyze_repository(str(repo), cache_path=str(cache)) == first
+    assert calls == []
+    assert cache.read_bytes() == saved
+
+
+def test_cache_rebuilt_when_head_rewritten(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path, 4)
+    cache = tmp_path / "cache.json"
+    analyzer.analyze_repository(str(repo), cache_path=str(cache))
+    _git(repo, "reset", "-q", "--hard", "HEAD~2")
+    _commit(repo, 9, "rewritten")
+
+    result = analyzer.analyze_repository(str(repo), cache_path=str(cache))
+
+    assert result == analyzer.analyze_repository(str(repo), max_workers=1)
+    assert result["file_commit_counts"]["notes.txt"] == 3
+
+
+def test_cache_rebuilt_on_version_bump(tmp_path: Path, monkeypatch) -> None:
+    repo = _make_repo(tmp_path, 3)
+    cache = tmp_path / "cache.json"
+    analyzer.analyze_repository(str(repo), cache_path=str(cache))
+    _commit(repo, 4, "more")
+    monkeypatch.setattr(analyzer, "_CACHE_VERSION", analyzer._CACHE_VERSION + 1)
+    calls = []
+    real_hits = analyzer._function_hits
+    monkeypatch.setattr(analyzer, "_function_hits", lambda commit: calls.append(commit) or real_hits(commit))
+
+    result = analyzer.analyze_repository(str(repo), cache_path=str(cache))
+
+    assert len(calls) == 4
+    assert result == analyzer.analyze_repository(str(repo), max_workers=1)
+    assert json.loads(cache.read_text())["version"] == analyzer._CACHE_VERSION
+
+
+def test_commit_log_without_diff_merges(tmp_path: Path, monkeypatch) -> None:
+    repo = _make_repo(tmp_path, 2)
+    branch = _git(repo, "rev-parse", "--abbrev-ref", "HEAD")
+    _git(repo, "checkout", "-q", "-b", "side")
+    _write(repo / "side.py", "def s():\n    return 1\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "side")
+    _git(repo, "checkout", "-q", branch)
+    _commit(repo, 3, "main")
+    _git(repo, "merge", "-q", "--no-ff", "side", "-m", "merge side")
+
+    expected = analyzer.analyze_repository(str(repo), max_workers=1)
+    monkeypatch.setattr(analyzer, "_supports_diff_merges", lambda repo: False)
+
+    assert analyzer.analyze_repository(str(repo), max_workers=1) == expected
+    assert expected["file_commit_counts"]["side.py"] == 2
+
+
+def test_pooled_run_matches_serial_run(tmp_path: Path, monkeypatch) -> None:
+    repo = _make_repo(tmp_path, 5)
+    serial = analyzer.analyze_repository(str(repo), max_workers=1)
+    monkeypatch.setattr(analyzer, "_PARALLEL_MIN_COMMITS", 1)
+
+    assert analyzer.analyze_repository(str(repo), max_workers=2) == serial
@@ -1,4 +1,5 @@
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -31,3 +32,86 @@ def test_build_context_map(tmp_path):
     with saved.open("r", encoding="utf-8") as fh:
         saved_data = json.load(fh)
     assert saved_data == context
+
+
+def test_build_context_map_parallel(tmp_path):
+    for i in range(70):
+        (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    g()\n", encoding="utf-8")
+
+    serial = build_context_map(tmp_path, max_workers=1)
+    (tmp_path / ".aether" / "context_map.cache.json").unlink()
+    parallel = build_context_map(tmp_path, max_workers=2)
+
+    assert parallel == serial
+    assert parallel["mod7.py"]["functions"]["f7"]["calls"] == ["g"]
+
+
+def test_build_context_map_reuses_cache(tmp_path, monkeypatch):
+    import aether.code_context as code_context
+
+    (tmp_path / "a.py").write_text("def a():\n    pass\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("def b():\n    pass\n", encoding="utf-8")
+    first = build_context_map(tmp_path)
+    assert (tmp_path / ".aether" / "context_map.cache.json").exists()
+
+    parsed = []
+    original = code_context.extract_file_context
+
+    def tracking(path):
+        parsed.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(code_context, "extract_file_context", tracking)
+    assert build_context_map(tmp_path) == first
+    assert parsed == []
+
+    (tmp_path / "b.py").write_text("def b():\n    c()\n", encoding="utf-8")
+    updated = build_context_map(tmp_path)
+    assert parsed == ["b.py"]
+    assert updated["b.py"]["functions"]["b"]["calls"] == ["c"]
+    assert updated["a.py"] == first["a.py"]
+
+
+def test_build_context_map_skips_hidden_dirs(tmp_path):
+    (tmp_path / "keep.py").write_text("x = 1\n", encoding="utf-8")
+    for hidden in (".venv", "__pycache__", "pkg/.git"):
+        (tmp_path / hidden).mkdir(parents=True)
+        (tmp_path / hidden / "skip.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "pkg" / "inner.py").write_text("x = 1\n", encoding="utf-8")
+
+    context = build_context_map(tmp_path)
+
+    assert sorted(context) == ["keep.py", str(Path("pkg") / "inner.py")]
+
+
+def test_build_context_map_skips_unreadable_dirs(tmp_path, monkeypatch):
+    (tmp_path / "ok").mkdir()
+    (tmp_path / "ok" / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / "b.py").write_text("x = 1\n", encoding="utf-8")
+    scandir = os.scandir
+
+    def guarded(path):
+        if os.path.basename(path) == "locked":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded)
+
+    context = build_context_map(tmp_path)
+
+    assert sorted(context) == [str(Path("ok") / "a.py")]
+
+
+def test_build_context_map_caches_per_output(tmp_path):
+    maps = tmp_path / "maps"
+    maps.mkdir()
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "mod.py").write_text(f"def {name}():\n    pass\n", encoding="utf-8")
+        build_context_map(tmp_path / name, output_path=maps / f"{name}.json")
+
+    again = build_context_map(tmp_path / "a", output_path=maps / "a.json")
+
+    assert sorted(p.name for p in maps.iterdir()) == ["a.cache.json", "a.json", "b.cache.json", "b.json"]
+    assert list(again["mod.py"]["functions"]) == ["a"]
@@ -24,3 +24,11 @@ def test_ascii_heatmap(tmp_path: Path):
     output = ascii_heatmap(risk_map, width=5)
     assert "a.py" in output and "HIGH" in output
     assert "b.py" in output and "LOW" in output
+
+
+def test_priority_thresholds():
+    from aether.heatmap_generator import _priority
+
+    assert _priority(0.39) == "LOW"
+    assert _priority(0.4) == "MED"
+    assert _priority(0.7) == "HIGH"
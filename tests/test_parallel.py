@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+# Ensure package root on path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aether import parallel
+from aether.parallel import map_in_processes
+
+_STATE = {}
+
+
+def _init(value):
+    _STATE["offset"] = value
+
+
+def _add_offset(x):
+    return x + _STATE["offset"]
+
+
+def test_small_batches_stay_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+
+    small = map_in_processes(_add_offset, range(3), min_items=4, initializer=_init, initargs=(10,))
+    single = map_in_processes(_add_offset, range(8), min_items=4, max_workers=1)
+
+    assert small == [10, 11, 12]
+    assert single == list(range(10, 18))
+
+
+def test_pool_matches_serial_order():
+    _STATE.clear()
+    result = map_in_processes(
+        _add_offset, range(20), min_items=4, max_workers=2, initializer=_init, initargs=(5,),
+        chunksize=3,
+    )
+
+    assert result == [x + 5 for x in range(20)]
+    assert _STATE == {}
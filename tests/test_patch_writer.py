@@ -0,0 +1,46 @@
+import json
+import os
+from pathlib import Path
+
+from aether.patch_writer import write_patches
+
+
+def test_write_patches(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "calm.py").write_text("y = 2\n", encoding="utf-8")
+    risk_map = tmp_path / "risk_map.json"
+    risk_map.write_text(
+        json.dumps(
+            [
+                {"filename": "mod.py", "risk_score": 0.9, "suggestions": ["add tests"]},
+                {"filename": "calm.py", "risk_score": 0.1, "suggestions": ["none"]},
+            ]
+        )
+    )
+
+    patched = write_patches(risk_map, tmp_path)
+
+    patch = tmp_path / "__aether_patch__" / "mod.py"
+    assert patched == [patch]
+    assert patch.read_text(encoding="utf-8") == "# [AETHER SUGGESTION]: add tests\n\nx = 1\n"
+
+    # Unchanged sources are not rewritten on the next run
+    mtime = patch.stat().st_mtime_ns
+    assert write_patches(risk_map, tmp_path) == [patch]
+    assert patch.stat().st_mtime_ns == mtime
+
+
+def test_write_patches_refreshes_same_size_edit(tmp_path: Path) -> None:
+    source = tmp_path / "m.py"
+    source.write_text("x = 1\n", encoding="utf-8")
+    risk_map = tmp_path / "risk_map.json"
+    risk_map.write_text(json.dumps([{"filename": "m.py", "risk_score": 0.9, "suggestions": []}]))
+    write_patches(risk_map, tmp_path)
+    old = source.stat()
+
+    # Same size, older mtime: as left behind by ``cp -p`` or ``rsync -t``
+    source.write_text("x = 2\n", encoding="utf-8")
+    os.utime(source, ns=(old.st_atime_ns, old.st_mtime_ns - 10**9))
+    write_patches(risk_map, tmp_path)
+
+    assert (tmp_path / "__aether_patch__" / "m.py").read_text(encoding="utf-8") == "x = 2\n"
@@ -45,3 +45,55 @@ def test_function_split_and_diff(tmp_path: Path) -> None:
     assert diff_file.exists()
     content = mutated.read_text()
     assert "_foo_impl" in content
+
+
+def test_docstring_diff_matches_difflib(tmp_path: Path) -> None:
+    import difflib
+
+    source = "import os\n\n\ndef foo(x):\n    return x\n\n\ndef bar():\n    pass\n"
+    module = tmp_path / "module.py"
+    module.write_text(source)
+    risk_map = tmp_path / "risk_map.json"
+    risk_map.write_text(
+        '[{"filename": "module.py", "risk_score": 0.9, "suggestions": ["add docstring"]}]'
+    )
+
+    rewrite_from_risk_map(risk_map, tmp_path, threshold=0.5)
+
+    mutated = tmp_path / "__aether_mutation__" / "module.py"
+    expected = difflib.unified_diff(
+        source.splitlines(keepends=True),
+        mutated.read_text().splitlines(keepends=True),
+        fromfile="original",
+        tofile="mutated",
+    )
+    diff_file = mutated.with_suffix(mutated.suffix + ".diff")
+    assert diff_file.read_text() == "".join(expected)
+
+
+def test_rewrite_from_risk_map_parallel(tmp_path: Path) -> None:
+    import json
+
+    entries = []
+    for i in range(40):
+        (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    # TODO\n    pass\n")
+        entries.append({"filename": f"mod{i}.py", "risk_score": 0.8, "suggestions": ["fix todo"]})
+    risk_map = tmp_path / "risk_map.json"
+    risk_map.write_text(json.dumps(entries))
+
+    results = rewrite_from_risk_map(risk_map, tmp_path, threshold=0.5, max_workers=2)
+
+    assert [r.original.name for r in results] == [f"mod{i}.py" for i in range(40)]
+    assert all(r.strategy == "complete_todo" for r in results)
+    assert "TODO handled by AETHER" in (tmp_path / "__aether_mutation__" / "mod3.py").read_text()
+
+
+def test_complete_todo_is_idempotent() -> None:
+    from aether.rewriter import _complete_todo
+
+    source = "x = 1  # TODO one\n# TODO two TODO three\ny = 2\n"
+    once, edits = _complete_todo(source)
+    assert once.count("TODO handled by AETHER") == 3
+    assert [index for index, _, _ in edits] == [0, 1]
+    assert _complete_todo(once) == (once, [])
+    assert _complete_todo("x = 1") == ("x = 1\n", [])